@@ -14,11 +14,26 @@ These functions handle:
 """
 
 import os
+import selectors
+import shutil
 import subprocess
 import threading
 import time
 import re
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
+
+
+# Contents of the README.md placeholder written into empty vaults
+_PLACEHOLDER_README = (
+    b"# My Obsidian Vault\n\n"
+    b"This vault is synchronized with GitHub using Ogresync.\n"
+    b"You can safely delete this README.md file and start adding your notes.\n"
+)
+
+
+# Git executable resolved once so each invocation skips the PATH search; if git is not
+# on PATH yet (e.g. installed later in the session) the bare name is looked up per call
+_GIT = shutil.which('git') or 'git'
 
 
 # =============================================================================
@@ -59,7 +74,8 @@ def _validate_url(url: str) -> bool:
     return False
 
 
-def _run_git_command_safe(command_parts: list, cwd: Optional[str] = None) -> Tuple[str, str, int]:
+def _run_git_command_safe(command_parts: list, cwd: Optional[str] = None,
+                          text: bool = True) -> Tuple[Union[str, bytes], Union[str, bytes], int]:
     """
     Run a git command safely using subprocess argument lists instead of shell strings.
     This prevents command injection vulnerabilities.
@@ -67,6 +83,7 @@ def _run_git_command_safe(command_parts: list, cwd: Optional[str] = None) -> Tup
     Args:
         command_parts: List of command parts (e.g., ['git', 'remote', 'add', 'origin', url])
         cwd: Working directory for the command
+        text: If False, stdout and stderr are returned as raw bytes without decoding
         
     Returns:
         Tuple of (stdout, stderr, return_code)
@@ -76,15 +93,16 @@ def _run_git_command_safe(command_parts: list, cwd: Optional[str] = None) -> Tup
             command_parts,
             cwd=cwd,
             capture_output=True,
-            text=True,
+            text=text,
             shell=False,  # Important: do not use shell=True
             timeout=30
         )
         return result.stdout, result.stderr, result.returncode
     except subprocess.TimeoutExpired:
-        return "", "Command timed out", 1
+        return ("", "Command timed out", 1) if text else (b"", b"Command timed out", 1)
     except Exception as e:
-        return "", f"Command execution error: {e}", 1
+        error = f"Command execution error: {e}"
+        return ("", error, 1) if text else (b"", error.encode("utf-8"), 1)
 
 
 # =============================================================================
@@ -130,6 +148,24 @@ def run_command(command, cwd=None, timeout=None):
         return "", str(e), 1
 
 
+def run_command_rc(command_parts, cwd=None, timeout=None):
+    """
+    Runs a command given as an argument list, discarding its output.
+    Returns only the exit code; use for side-effect operations whose output is unused.
+    Safe to call in a background thread.
+    """
+    try:
+        return subprocess.call(
+            command_parts,
+            cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout
+        )
+    except Exception:
+        return 1
+
+
 def safe_update_log(message, progress=None):
     """
     Safe logging function that uses the injected dependency.
@@ -141,6 +177,69 @@ def safe_update_log(message, progress=None):
         print(f"[LOG] {message}")
 
 
+def _run_git_fetch_with_progress(vault_path, branch=None, timeout=None):
+    """
+    Runs 'git fetch origin' (only the given branch, if one is passed), forwarding git's
+    progress output to the log while it runs instead of blocking silently until the fetch finishes.
+    The fetch is terminated if it takes longer than timeout seconds.
+    Returns the exit code.
+    """
+    command = [_GIT, 'fetch', '--progress', 'origin']
+    if branch:
+        command.append(branch)
+    try:
+        process = subprocess.Popen(
+            command,
+            cwd=vault_path,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+    except Exception as e:
+        safe_update_log(f"Error starting git fetch: {e}", None)
+        return 1
+    
+    if os.name == 'nt':
+        # Windows cannot poll pipes with select(), so just wait for completion
+        try:
+            process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            process.communicate()
+            return 1
+        return process.returncode
+    
+    deadline = time.monotonic() + timeout if timeout else None
+    pending = b""
+    last_progress_log = 0.0
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stderr, selectors.EVENT_READ)
+        while True:
+            if deadline and time.monotonic() > deadline:
+                process.terminate()
+                process.wait()
+                process.stderr.close()
+                return 1
+            if not selector.select(timeout=0.1):
+                continue
+            chunk = os.read(process.stderr.fileno(), 4096)
+            if not chunk:
+                break
+            # Progress updates are separated by '\r', finished lines by '\n'
+            pending += chunk.replace(b"\r\n", b"\n")
+            *segments, pending = re.split(rb"([\r\n])", pending)
+            for text, separator in zip(segments[0::2], segments[1::2]):
+                line = text.decode("utf-8", "replace").strip()
+                if not line:
+                    continue
+                now = time.monotonic()
+                if separator == b"\n" or now - last_progress_log >= 1.0:
+                    safe_update_log(f"git fetch: {line}", None)
+                    last_progress_log = now
+    process.stderr.close()
+    return process.wait()
+
+
 # ------------------------------------------------
 # GITHUB SETUP FUNCTIONS
 # ------------------------------------------------
@@ -150,8 +249,7 @@ def is_git_repo(folder_path):
     Checks if a folder is already a Git repository.
     Returns True if the folder is a Git repo, otherwise False.
     """
-    out, err, rc = run_command("git rev-parse --is-inside-work-tree", cwd=folder_path)
-    return rc == 0
+    return run_command_rc([_GIT, 'rev-parse', '--is-inside-work-tree'], cwd=folder_path) == 0
 
 
 def initialize_git_repo(vault_path):
@@ -161,13 +259,17 @@ def initialize_git_repo(vault_path):
     """
     if not is_git_repo(vault_path):
         safe_update_log("Initializing Git repository in vault...", 15)
-        out, err, rc = run_command("git init", cwd=vault_path)
+        # git 2.28+ can name the initial branch directly; older versions reject the option
+        out, err, rc = _run_git_command_safe([_GIT, 'init', '--initial-branch=main'], cwd=vault_path)
+        if rc != 0:
+            out, err, rc = _run_git_command_safe([_GIT, 'init'], cwd=vault_path)
+            if rc == 0:
+                run_command_rc([_GIT, 'branch', '-M', 'main'], cwd=vault_path)
         if rc == 0:
-            run_command("git branch -M main", cwd=vault_path)
             safe_update_log("Git repository initialized successfully.", 20)
             return True
         else:
-            safe_update_log("Error initializing Git repository: " + err, 20)
+            safe_update_log("Error initializing Git repository: " + err.strip(), 20)
             return False
     else:
         safe_update_log("Vault is already a Git repository.", 20)
@@ -187,8 +289,10 @@ def set_github_remote(vault_path, ui_elements=None, config_data=None):
     if config_data is None:
         config_data = _config_data
     # Check if a remote named 'origin' already exists
-    existing_remote_url, err, rc = run_command("git remote get-url origin", cwd=vault_path)
+    has_existing_origin = False
+    existing_remote_url, err, rc = _run_git_command_safe([_GIT, 'remote', 'get-url', 'origin'], cwd=vault_path)
     if rc == 0:
+        existing_remote_url = existing_remote_url.strip()
         safe_update_log(f"A remote named 'origin' already exists: {existing_remote_url}", 25)
         if ui_elements:
             override = ui_elements.ask_yes_no(
@@ -200,10 +304,9 @@ def set_github_remote(vault_path, ui_elements=None, config_data=None):
                 safe_update_log("Keeping the existing 'origin' remote. Skipping new remote configuration.", 25)
                 return True
             else:
-                out, err, rc = run_command("git remote remove origin", cwd=vault_path)
-                if rc != 0:
-                    safe_update_log(f"Failed to remove existing remote: {err}", 25)
-                safe_update_log("Existing 'origin' remote removed.", 25)
+                # The URL is replaced in place with 'git remote set-url' once a new one is provided
+                has_existing_origin = True
+                safe_update_log("Existing 'origin' remote will be replaced.", 25)
 
     # Prompt for linking a repository
     if ui_elements:
@@ -227,9 +330,13 @@ def set_github_remote(vault_path, ui_elements=None, config_data=None):
                         ui_elements.show_error_message("Invalid URL", "The provided URL is not valid. Please enter a valid GitHub repository URL.")
                     return False
                 
-                out, err, rc = _run_git_command_safe(['git', 'remote', 'add', 'origin', repo_url], cwd=vault_path)
+                remote_action = 'set-url' if has_existing_origin else 'add'
+                out, err, rc = _run_git_command_safe([_GIT, 'remote', remote_action, 'origin', repo_url], cwd=vault_path)
                 if rc == 0:
-                    safe_update_log(f"Git remote added: {repo_url}", 30)
+                    if has_existing_origin:
+                        safe_update_log(f"Git remote updated: {repo_url}", 30)
+                    else:
+                        safe_update_log(f"Git remote added: {repo_url}", 30)
                     if config_data:
                         config_data["GITHUB_REMOTE_URL"] = repo_url
                     return True
@@ -273,10 +380,12 @@ def ensure_placeholder_file(vault_path):
         # Only create placeholder if vault is completely empty
         if not vault_files:
             placeholder_path = os.path.join(vault_path, "README.md")
-            with open(placeholder_path, "w", encoding="utf-8") as f:
-                f.write("# My Obsidian Vault\n\n")
-                f.write("This vault is synchronized with GitHub using Ogresync.\n")
-                f.write("You can safely delete this README.md file and start adding your notes.\n")
+            # Write the whole placeholder in a single call
+            fd = os.open(placeholder_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, _PLACEHOLDER_README)
+            finally:
+                os.close(fd)
             safe_update_log("Placeholder file 'README.md' created, as the vault was empty.", 5)
         else:
             safe_update_log(f"Vault contains {len(vault_files)} files - no placeholder needed.", 5)
@@ -319,7 +428,7 @@ def configure_remote_url_for_vault(vault_path, ui_elements=None, config_data=Non
                 # Continue to ask for new URL
             else:
                 safe_update_log(f"Using saved remote URL: {saved_url}", None)
-                out, err, rc = _run_git_command_safe(['git', 'remote', 'add', 'origin', saved_url], cwd=vault_path)
+                out, err, rc = _run_git_command_safe([_GIT, 'remote', 'add', 'origin', saved_url], cwd=vault_path)
                 if rc == 0:
                     safe_update_log(f"Git remote configured: {saved_url}", None)
                     return True
@@ -348,7 +457,7 @@ def configure_remote_url_for_vault(vault_path, ui_elements=None, config_data=Non
                 ui_elements.show_error_message("Invalid URL", "The provided URL is not valid. Please enter a valid GitHub repository URL.")
                 return False
             
-            out, err, rc = _run_git_command_safe(['git', 'remote', 'add', 'origin', repo_url], cwd=vault_path)
+            out, err, rc = _run_git_command_safe([_GIT, 'remote', 'add', 'origin', repo_url], cwd=vault_path)
             if rc == 0:
                 safe_update_log(f"Git remote configured: {repo_url}", None)
                 
@@ -392,9 +501,9 @@ def analyze_repository_state(vault_path):
     # Check for local files (excluding .git directory)
     try:
         for root_dir, dirs, files in os.walk(vault_path):
-            # Skip .git directory
-            if '.git' in root_dir:
-                continue
+            # Skip .git directory (pruned so os.walk never descends into it)
+            if '.git' in dirs:
+                dirs.remove('.git')
             for file in files:
                 # Skip hidden files and common non-content files
                 if not file.startswith('.') and file not in ['README.md', '.gitignore']:
@@ -407,15 +516,22 @@ def analyze_repository_state(vault_path):
     
     # Check for remote files by attempting to fetch
     try:
-        # Try to fetch remote refs to see if repository has content
-        fetch_out, fetch_err, fetch_rc = run_command("git fetch origin", cwd=vault_path)
+        # Try to fetch the remote main branch to see if repository has content,
+        # showing fetch progress in the log while it runs; only origin/main is
+        # listed below, so other branches and tags are not negotiated or downloaded
+        fetch_rc = _run_git_fetch_with_progress(vault_path, 'main')
         if fetch_rc == 0:
             # Check if remote main branch exists and has files
-            ls_out, ls_err, ls_rc = run_command("git ls-tree -r --name-only origin/main", cwd=vault_path)
+            # The listing can be large, so it is kept as bytes and only
+            # the filenames that are actually kept get decoded
+            ls_out, ls_err, ls_rc = _run_git_command_safe(
+                [_GIT, 'ls-tree', '-r', '--name-only', 'origin/main'], cwd=vault_path, text=False
+            )
             if ls_rc == 0 and ls_out.strip():
-                remote_files = [f.strip() for f in ls_out.splitlines() if f.strip() and not f.startswith('.')]
+                remote_files = [f.strip() for f in ls_out.splitlines() if f.strip() and not f.startswith(b'.')]
                 # Filter out common non-content files
-                analysis["remote_files"] = [f for f in remote_files if f not in ['README.md', '.gitignore']]
+                analysis["remote_files"] = [f.decode('utf-8', 'surrogateescape') for f in remote_files
+                                            if f not in (b'README.md', b'.gitignore')]
                 analysis["has_remote_files"] = len(analysis["remote_files"]) > 0
     except Exception as e:
         safe_update_log(f"Error analyzing remote repository: {e}", None)
@@ -477,16 +593,16 @@ def ensure_git_user_config():
     """
     try:
         # Check if user.name is configured
-        name_out, name_err, name_rc = run_command("git config --global user.name")
+        name_out, name_err, name_rc = _run_git_command_safe([_GIT, 'config', '--global', 'user.name'])
         if name_rc != 0 or not name_out.strip():
             safe_update_log("Setting default Git user name...", None)
-            run_command('git config --global user.name "Ogresync User"')
+            run_command_rc([_GIT, 'config', '--global', 'user.name', 'Ogresync User'])
         
         # Check if user.email is configured
-        email_out, email_err, email_rc = run_command("git config --global user.email")
+        email_out, email_err, email_rc = _run_git_command_safe([_GIT, 'config', '--global', 'user.email'])
         if email_rc != 0 or not email_out.strip():
             safe_update_log("Setting default Git user email...", None)
-            run_command('git config --global user.email "ogresync@example.com"')
+            run_command_rc([_GIT, 'config', '--global', 'user.email', 'ogresync@example.com'])
             
     except Exception as e:
         safe_update_log(f"Warning: Could not configure Git user settings: {e}", None)
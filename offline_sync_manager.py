@@ -16,40 +16,106 @@ Date: June 2025
 """
 
 import os
+import sys
 import json
+import socket
+import subprocess
 import time
+from array import array
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
+from functools import partial
 from enum import Enum
 
-# Import existing modules
+# orjson is optional; the standard library json module is used when it is missing
 try:
-    from backup_manager import OgresyncBackupManager, BackupReason
-    BACKUP_MANAGER_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    OgresyncBackupManager = None
-    BackupReason = None
-    BACKUP_MANAGER_AVAILABLE = False
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Bound once for the network probe
+_create_connection = socket.create_connection
+
+# Existing modules are imported lazily, on first use, to keep import time low
+OgresyncBackupManager = None
+BackupReason = None
+_backup_manager_import_attempted = False
 
-try:
-    import Stage1_conflict_resolution as conflict_resolution
-    CONFLICT_RESOLUTION_AVAILABLE = True
-except ImportError:
-    conflict_resolution = None
-    CONFLICT_RESOLUTION_AVAILABLE = False
+
+def _load_backup_manager():
+    """Import the backup manager on first use; returns the manager class or None"""
+    global OgresyncBackupManager, BackupReason, _backup_manager_import_attempted
+    if not _backup_manager_import_attempted:
+        _backup_manager_import_attempted = True
+        try:
+            from backup_manager import OgresyncBackupManager as _manager_class, BackupReason as _reason_enum
+            OgresyncBackupManager = _manager_class
+            BackupReason = _reason_enum
+        except ImportError:
+            pass
+    return OgresyncBackupManager
 
 
 # =============================================================================
 # OFFLINE SYNC DATA STRUCTURES
 # =============================================================================
 
+# dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class NetworkState(Enum):
     """Network connectivity states"""
     ONLINE = "online"
     OFFLINE = "offline"
     UNKNOWN = "unknown"
 
+# Compact byte encoding of NetworkState used by the network state history
+_NETWORK_STATE_BY_CODE = (NetworkState.ONLINE, NetworkState.OFFLINE, NetworkState.UNKNOWN)
+_NETWORK_STATE_CODES = {state: code for code, state in enumerate(_NETWORK_STATE_BY_CODE)}
+
+# Number of network state samples kept in the history
+_NETWORK_HISTORY_LIMIT = 50
+
+# Bound once for the serialization hot path
+_ISO = datetime.isoformat
+
+# Size at which the append-only network log is compacted back to the kept samples
+_NETWORK_LOG_MAX_BYTES = 64 * 1024
+
+# State changes within this many seconds of the last save are coalesced into one write,
+# unless this many changes are already pending
+_SAVE_DEBOUNCE_SECONDS = 0.25
+_SAVE_MAX_PENDING_CHANGES = 10
+
+
+def _to_timestamp_ns(when: datetime) -> int:
+    """Convert a datetime to integer unix nanoseconds (microsecond precision)"""
+    return round(when.timestamp() * 1_000_000) * 1000
+
+
+def _network_log_line(timestamp_ns: int, code: int) -> bytes:
+    """Encode one network state sample as a JSON line of the network log"""
+    entry = [_ISO(datetime.fromtimestamp(timestamp_ns / 1e9)), _NETWORK_STATE_BY_CODE[code].value]
+    return (json.dumps(entry) + '\n').encode('utf-8')
+
+# Files under .git whose (mtime, size) change when HEAD, the index or origin/main move
+# (the current branch's loose ref is added by _git_state_key())
+_GIT_STATE_FILES = (
+    'index',
+    'HEAD',
+    os.path.join('logs', 'HEAD'),
+    'packed-refs',
+    os.path.join('refs', 'remotes', 'origin', 'main'),
+)
+
+# Vault path -> _git_state_key() when complete_successful_sync() last found nothing unpushed.
+# Kept for the whole process, since each sync step works through a new manager
+_clean_git_keys: Dict[str, Tuple] = {}
+
 class SyncMode(Enum):
     """Synchronization modes"""
     ONLINE_TO_ONLINE = "online_to_online"       # Current default behavior
@@ -57,7 +123,14 @@ class SyncMode(Enum):
     OFFLINE_TO_ONLINE = "offline_to_online"     # Delayed sync mode
     ONLINE_TO_OFFLINE = "online_to_offline"     # Hybrid mode
 
-@dataclass
+# Sync modes counted as offline sessions in the session summary
+_OFFLINE_SYNC_MODES = frozenset((SyncMode.OFFLINE_TO_OFFLINE, SyncMode.OFFLINE_TO_ONLINE))
+
+# Enum members by stored value, so loading skips the Enum constructor
+_NETWORK_STATE_BY_VALUE = {state.value: state for state in NetworkState}
+_SYNC_MODE_BY_VALUE = {mode.value: mode for mode in SyncMode}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class OfflineSession:
     """Information about an offline editing session"""
     session_id: str
@@ -69,15 +142,83 @@ class OfflineSession:
     sync_mode: SyncMode
     requires_conflict_resolution: bool = False
     backup_id: Optional[str] = None
+    # Cached to_json_dict() result, cleared whenever a field is reassigned
+    _serialized: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != '_serialized':
+            object.__setattr__(self, '_serialized', None)
+    
+    def to_json_dict(self) -> Dict[str, Any]:
+        """
+        Build the JSON-serializable representation of this session.
+        The result is cached until a field is reassigned, so unchanged sessions
+        are not rebuilt on every save (in-place edits of local_commits are not tracked).
+        """
+        if self._serialized is None:
+            self._serialized = self._build_json_dict()
+        return self._serialized
+    
+    def _build_json_dict(self) -> Dict[str, Any]:
+        """Build the JSON-serializable representation from the current fields"""
+        return {
+            'session_id': self.session_id,
+            'start_time': _ISO(self.start_time),
+            'end_time': _ISO(self.end_time) if self.end_time else None,
+            'network_start': self.network_start.value,
+            'network_end': self.network_end.value if self.network_end else None,
+            'local_commits': self.local_commits,
+            'sync_mode': self.sync_mode.value,
+            'requires_conflict_resolution': self.requires_conflict_resolution,
+            'backup_id': self.backup_id
+        }
+    
+    @classmethod
+    def from_json_dict(cls, data: Dict[str, Any]) -> 'OfflineSession':
+        """Rebuild a session from its JSON representation"""
+        return cls(
+            session_id=data['session_id'],
+            start_time=datetime.fromisoformat(data['start_time']),
+            end_time=datetime.fromisoformat(data['end_time']) if data.get('end_time') else None,
+            network_start=_NETWORK_STATE_BY_VALUE[data['network_start']],
+            network_end=_NETWORK_STATE_BY_VALUE[data['network_end']] if data.get('network_end') else None,
+            local_commits=data.get('local_commits', []),
+            sync_mode=_SYNC_MODE_BY_VALUE[data['sync_mode']],
+            requires_conflict_resolution=data.get('requires_conflict_resolution', False),
+            backup_id=data.get('backup_id')
+        )
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class OfflineState:
     """Current offline synchronization state"""
     has_unpushed_commits: bool
     offline_sessions: List[OfflineSession]
     last_successful_sync: Optional[datetime]
     pending_sync_operations: List[str]
-    network_state_history: List[Tuple[datetime, NetworkState]]
+    # Network state history stored as parallel arrays: unix timestamps (ns) and state codes
+    network_timestamps: array = field(default_factory=partial(array, 'q'))
+    network_states: bytearray = field(default_factory=bytearray)
+    
+    def record_network_state(self, state: NetworkState, timestamp_ns: Optional[int] = None):
+        """Append a network state sample, keeping only the most recent ones"""
+        self.network_timestamps.append(time.time_ns() if timestamp_ns is None else timestamp_ns)
+        self.network_states.append(_NETWORK_STATE_CODES[state])
+        if len(self.network_states) > _NETWORK_HISTORY_LIMIT:
+            del self.network_timestamps[:-_NETWORK_HISTORY_LIMIT]
+            del self.network_states[:-_NETWORK_HISTORY_LIMIT]
+    
+    def sessions_to_json_list(self) -> List[Dict[str, Any]]:
+        """Build the JSON-serializable list of session records"""
+        return [session.to_json_dict() for session in self.offline_sessions]
+    
+    def meta_to_json_dict(self) -> Dict[str, Any]:
+        """Build the JSON-serializable representation of the small sync flags"""
+        return {
+            'has_unpushed_commits': self.has_unpushed_commits,
+            'last_successful_sync': _ISO(self.last_successful_sync) if self.last_successful_sync else None,
+            'pending_sync_operations': self.pending_sync_operations
+        }
 
 
 # =============================================================================
@@ -90,133 +231,345 @@ class OfflineSyncManager:
     def __init__(self, vault_path: str, config_data: Dict[str, str]):
         self.vault_path = vault_path
         self.config_data = config_data
-        self.offline_state_file = os.path.join(vault_path, ".ogresync-offline-state.json")
+        # Session records and the small sync flags are saved separately, so a flag
+        # change does not rewrite every session (the network log is append-only)
+        self.sessions_file = os.path.join(vault_path, ".ogresync-offline-sessions.json")
+        self.meta_file = os.path.join(vault_path, ".ogresync-offline-meta.json")
+        self.offline_state_file = os.path.join(vault_path, ".ogresync-offline-state.json")  # legacy single file
+        self.network_log_file = os.path.join(vault_path, ".ogresync-network-log.jsonl")
+        self._network_log_handle = None  # opened on first append
         self.network_check_timeout = 5  # seconds
+        self.network_cache_ttl = 15  # seconds a probe result is reused
+        self._network_cache: Optional[Tuple[float, NetworkState]] = None
+        
+        # Memoized get_unpushed_commits() result, keyed by _git_state_key()
+        self._unpushed_cache: Optional[Tuple[Tuple, List[str]]] = None
+        
+        # Unsaved state changes, written out by _mark_dirty() / flush()
+        self._pending_changes = 0
+        self._last_save = 0.0
+        self._sessions_dirty = False
+        self._meta_dirty = False
         
         # Load or initialize offline state
+        self._legacy_state_loaded = False
         self.offline_state = self._load_offline_state()
+        if self._legacy_state_loaded:
+            self._migrate_legacy_state_file()
+        self._sessions_by_id: Dict[str, OfflineSession] = {}
+        self._n_unresolved = 0          # sessions requiring conflict resolution
+        self._n_open_unresolved = 0     # ...of which have not ended yet
+        self._n_offline_sessions = 0    # sessions in an offline sync mode
+        self._index_sessions()
         
         # Set up backup manager if available
         self.backup_manager = None
-        if BACKUP_MANAGER_AVAILABLE and OgresyncBackupManager:
-            self.backup_manager = OgresyncBackupManager(vault_path)
+        backup_manager_class = _load_backup_manager()
+        if backup_manager_class:
+            self.backup_manager = backup_manager_class(vault_path)
     
     def _load_offline_state(self) -> OfflineState:
         """Load offline state from disk or create new"""
-        if os.path.exists(self.offline_state_file):
-            try:
-                with open(self.offline_state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Convert datetime strings back to datetime objects
-                sessions = []
-                for session_data in data.get('offline_sessions', []):
-                    session = OfflineSession(
-                        session_id=session_data['session_id'],
-                        start_time=datetime.fromisoformat(session_data['start_time']),
-                        end_time=datetime.fromisoformat(session_data['end_time']) if session_data.get('end_time') else None,
-                        network_start=NetworkState(session_data['network_start']),
-                        network_end=NetworkState(session_data['network_end']) if session_data.get('network_end') else None,
-                        local_commits=session_data.get('local_commits', []),
-                        sync_mode=SyncMode(session_data['sync_mode']),
-                        requires_conflict_resolution=session_data.get('requires_conflict_resolution', False),
-                        backup_id=session_data.get('backup_id')
-                    )
-                    sessions.append(session)
-                
-                network_history = []
-                for hist_data in data.get('network_state_history', []):
-                    network_history.append((
-                        datetime.fromisoformat(hist_data[0]),
-                        NetworkState(hist_data[1])
-                    ))
-                
-                return OfflineState(
-                    has_unpushed_commits=data.get('has_unpushed_commits', False),
-                    offline_sessions=sessions,
-                    last_successful_sync=datetime.fromisoformat(data['last_successful_sync']) if data.get('last_successful_sync') else None,
-                    pending_sync_operations=data.get('pending_sync_operations', []),
-                    network_state_history=network_history
-                )
-            except Exception as e:
-                print(f"Warning: Could not load offline state: {e}")
+        try:
+            if os.path.exists(self.sessions_file) or os.path.exists(self.meta_file):
+                meta = self._read_state_file(self.meta_file) or {}
+                sessions_data = self._read_state_file(self.sessions_file) or []
+                state = self._build_offline_state(meta, sessions_data)
+                self._load_network_log(state)
+                return state
+            
+            if os.path.exists(self.offline_state_file):
+                data = self._read_state_file(self.offline_state_file)
+                state = self._build_offline_state(data, data.get('offline_sessions', []))
+                # State files written before the network log existed embed the history
+                record, fromisoformat = state.record_network_state, datetime.fromisoformat
+                legacy_history = deque(data.pop('network_state_history', ()), maxlen=_NETWORK_HISTORY_LIMIT)
+                for hist_data in legacy_history:
+                    record(_NETWORK_STATE_BY_VALUE[hist_data[1]], _to_timestamp_ns(fromisoformat(hist_data[0])))
+                self._load_network_log(state)
+                self._legacy_state_loaded = True
+                return state
+        except Exception as e:
+            print(f"Warning: Could not load offline state: {e}")
         
         # Return default state
-        return OfflineState(
+        state = OfflineState(
             has_unpushed_commits=False,
             offline_sessions=[],
             last_successful_sync=None,
-            pending_sync_operations=[],
-            network_state_history=[]
+            pending_sync_operations=[]
         )
+        self._load_network_log(state)
+        return state
     
-    def _save_offline_state(self):
-        """Save offline state to disk"""
+    @staticmethod
+    def _build_offline_state(meta: Dict[str, Any], sessions_data: List[Dict[str, Any]]) -> OfflineState:
+        """Compose an OfflineState from the saved flags and session records"""
+        return OfflineState(
+            has_unpushed_commits=meta.get('has_unpushed_commits', False),
+            offline_sessions=[OfflineSession.from_json_dict(session_data) for session_data in sessions_data],
+            last_successful_sync=datetime.fromisoformat(meta['last_successful_sync']) if meta.get('last_successful_sync') else None,
+            pending_sync_operations=meta.get('pending_sync_operations', [])
+        )
+    
+    @staticmethod
+    def _read_state_file(path: str) -> Any:
+        """Read a JSON state file, returning None if it does not exist"""
         try:
-            # Convert to serializable format
-            data = {
-                'has_unpushed_commits': self.offline_state.has_unpushed_commits,
-                'offline_sessions': [],
-                'last_successful_sync': self.offline_state.last_successful_sync.isoformat() if self.offline_state.last_successful_sync else None,
-                'pending_sync_operations': self.offline_state.pending_sync_operations,
-                'network_state_history': [(dt.isoformat(), state.value) for dt, state in self.offline_state.network_state_history]
-            }
-            
-            # Convert sessions
-            for session in self.offline_state.offline_sessions:
-                session_data = {
-                    'session_id': session.session_id,
-                    'start_time': session.start_time.isoformat(),
-                    'end_time': session.end_time.isoformat() if session.end_time else None,
-                    'network_start': session.network_start.value,
-                    'network_end': session.network_end.value if session.network_end else None,
-                    'local_commits': session.local_commits,
-                    'sync_mode': session.sync_mode.value,
-                    'requires_conflict_resolution': session.requires_conflict_resolution,
-                    'backup_id': session.backup_id
-                }
-                data['offline_sessions'].append(session_data)
+            with open(path, 'rb') as f:
+                raw_data = f.read()
+        except FileNotFoundError:
+            return None
+        return orjson.loads(raw_data) if ORJSON_AVAILABLE else json.loads(raw_data)
+    
+    @staticmethod
+    def _write_state_file(path: str, data: Any, durable: bool = False) -> bool:
+        """
+        Write a JSON state file, returning whether it succeeded.
+        The file is replaced atomically; durable=True also syncs it to disk first.
+        """
+        try:
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode('utf-8')
             
-            with open(self.offline_state_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            temp_file = path + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, path)
+            return True
         except Exception as e:
             print(f"Warning: Could not save offline state: {e}")
+            return False
+    
+    def _migrate_legacy_state_file(self):
+        """Split a single-file state from an older version into the sessions and meta files"""
+        self._save_offline_state()
+        if not (self._sessions_dirty or self._meta_dirty):
+            try:
+                os.remove(self.offline_state_file)
+            except OSError:
+                pass
+    
+    def _load_network_log(self, state: OfflineState):
+        """Load the most recent network state samples from the append-only log"""
+        if not os.path.exists(self.network_log_file):
+            if len(state.network_states):
+                # Carry over history read from an older state file
+                self._rewrite_network_log(state)
+            return
+        
+        try:
+            with open(self.network_log_file, 'rb') as f:
+                # Only the tail is needed; skip ahead if compaction did not keep the log small
+                if os.fstat(f.fileno()).st_size > _NETWORK_LOG_MAX_BYTES:
+                    f.seek(-_NETWORK_LOG_MAX_BYTES, os.SEEK_END)
+                    f.readline()  # drop the partial line
+                recent_lines = deque(f, maxlen=_NETWORK_HISTORY_LIMIT)
+        except Exception as e:
+            print(f"Warning: Could not load network log: {e}")
+            return
+        
+        record, fromisoformat = state.record_network_state, datetime.fromisoformat
+        for line in recent_lines:
+            try:
+                timestamp, value = json.loads(line)
+                record(_NETWORK_STATE_BY_VALUE[value], _to_timestamp_ns(fromisoformat(timestamp)))
+            except (ValueError, KeyError):
+                continue  # skip a partially written or unrecognized line
+    
+    def _append_network_log(self):
+        """Append the latest network state sample to the log, compacting it when it grows too large"""
+        try:
+            if self._network_log_handle is None:
+                self._network_log_handle = open(self.network_log_file, 'ab', buffering=0)
+            self._network_log_handle.write(_network_log_line(
+                self.offline_state.network_timestamps[-1], self.offline_state.network_states[-1]
+            ))
+            if self._network_log_handle.tell() > _NETWORK_LOG_MAX_BYTES:
+                self._rewrite_network_log(self.offline_state)
+        except Exception as e:
+            print(f"Warning: Could not write network log: {e}")
+    
+    def _rewrite_network_log(self, state: OfflineState):
+        """Replace the network log with only the samples currently kept in memory"""
+        self._close_network_log()
+        try:
+            temp_file = self.network_log_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.writelines(_network_log_line(ts, code)
+                             for ts, code in zip(state.network_timestamps, state.network_states))
+            os.replace(temp_file, self.network_log_file)
+        except Exception as e:
+            print(f"Warning: Could not rewrite network log: {e}")
+    
+    def _close_network_log(self):
+        """Close the network log handle, if open"""
+        handle, self._network_log_handle = self._network_log_handle, None
+        if handle is not None:
+            handle.close()
+    
+    def _save_offline_state(self):
+        """Save offline state to disk"""
+        self._sessions_dirty = self._meta_dirty = True
+        self.flush(durable=True)
+    
+    def _save_sessions(self, durable: bool = False):
+        """Save the session records"""
+        if self._write_state_file(self.sessions_file, self.offline_state.sessions_to_json_list(), durable):
+            self._sessions_dirty = False
+    
+    def _save_meta(self, durable: bool = False):
+        """Save the small sync flags"""
+        if self._write_state_file(self.meta_file, self.offline_state.meta_to_json_dict(), durable):
+            self._meta_dirty = False
+    
+    def _index_sessions(self):
+        """Rebuild the session_id lookup and session counters after the session list was replaced"""
+        self._sessions_by_id = {}
+        self._n_unresolved = self._n_open_unresolved = self._n_offline_sessions = 0
+        for session in self.offline_state.offline_sessions:
+            # Like a front-to-back scan, the first session with a given id wins
+            self._sessions_by_id.setdefault(session.session_id, session)
+            self._count_session(session, 1)
+    
+    def _count_session(self, session: OfflineSession, sign: int):
+        """Add (sign=1) or remove (sign=-1) a session's contribution to the session counters"""
+        if session.requires_conflict_resolution:
+            self._n_unresolved += sign
+            if session.end_time is None:
+                self._n_open_unresolved += sign
+        if session.sync_mode in _OFFLINE_SYNC_MODES:
+            self._n_offline_sessions += sign
+    
+    def _mark_dirty(self, sessions: bool = True, meta: bool = False):
+        """Record a state change, saving right away unless a save happened very recently"""
+        self._sessions_dirty |= sessions
+        self._meta_dirty |= meta
+        self._pending_changes += 1
+        if (self._pending_changes >= _SAVE_MAX_PENDING_CHANGES
+                or time.monotonic() - self._last_save > _SAVE_DEBOUNCE_SECONDS):
+            self.flush()
+    
+    def flush(self, durable: bool = False):
+        """
+        Save the parts of the offline state that have unsaved changes.
+        Pass durable=True at session boundaries to also sync the files to disk.
+        """
+        if self._sessions_dirty:
+            self._save_sessions(durable)
+        if self._meta_dirty:
+            self._save_meta(durable)
+        self._pending_changes = 0
+        self._last_save = time.monotonic()
     
     def check_network_availability(self) -> NetworkState:
         """Enhanced network detection with history tracking"""
+        # Reuse a recent probe result instead of connecting again
+        now = time.monotonic()
+        if self._network_cache is not None and now - self._network_cache[0] < self.network_cache_ttl:
+            return self._network_cache[1]
+        
         try:
-            import socket
-            socket.create_connection(("github.com", 443), timeout=self.network_check_timeout)
-            
+            _create_connection(("github.com", 443), timeout=self.network_check_timeout).close()
             current_state = NetworkState.ONLINE
-            
-            # Record network state change
-            self.offline_state.network_state_history.append((datetime.now(), current_state))
-            
-            # Keep only last 50 network state changes
-            if len(self.offline_state.network_state_history) > 50:
-                self.offline_state.network_state_history = self.offline_state.network_state_history[-50:]
-            
-            self._save_offline_state()
-            return current_state
-            
         except Exception:
             current_state = NetworkState.OFFLINE
-            
-            # Record network state change
-            self.offline_state.network_state_history.append((datetime.now(), current_state))
-            
-            # Keep only last 50 network state changes  
-            if len(self.offline_state.network_state_history) > 50:
-                self.offline_state.network_state_history = self.offline_state.network_state_history[-50:]
-            
-            self._save_offline_state()
-            return current_state
+        
+        self._network_cache = (now, current_state)
+        
+        # Record network state change (history keeps only the last 50 samples);
+        # only the new sample is written, the rest of the state is left untouched
+        self.offline_state.record_network_state(current_state)
+        self._append_network_log()
+        return current_state
+    
+    def _resolve_revisions(self, *revisions: str) -> List[Optional[str]]:
+        """
+        Resolve revisions to object ids with one 'git cat-file --batch-check' process
+        for all of them, instead of a git process per query. Unknown revisions resolve to None.
+        The process exits once the queries are answered; it is killed if git hangs.
+        """
+        try:
+            result = subprocess.run(
+                ['git', 'cat-file', '--batch-check=%(objectname)'],
+                cwd=self.vault_path, input=''.join(revision + '\n' for revision in revisions),
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10
+            )
+        except Exception:
+            return [None] * len(revisions)
+        
+        lines = result.stdout.splitlines()
+        if len(lines) != len(revisions):
+            return [None] * len(revisions)
+        return [line if line and not line.endswith(' missing') else None for line in lines]
+    
+    def close(self):
+        """Save pending changes and release resources held by the manager"""
+        self.flush(durable=True)
+        self._close_network_log()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _git_state_key(self) -> Optional[Tuple[Optional[Tuple[int, int]], ...]]:
+        """
+        Build a cache key from the (mtime, size) of the git files that change whenever
+        HEAD, the index or origin/main move. Returns None if .git is not a directory.
+        """
+        git_dir = os.path.join(self.vault_path, '.git')
+        if not os.path.isdir(git_dir):
+            return None
+        names = list(_GIT_STATE_FILES)
+        # A commit made outside this app updates the branch ref HEAD points to, not HEAD itself
+        try:
+            with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as f:
+                head = f.read().strip()
+            if head.startswith('ref: '):
+                names.append(os.path.join(*head[5:].split('/')))
+        except OSError:
+            pass
+        key = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(git_dir, name))
+                key.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                key.append(None)
+        return tuple(key)
+    
+    def _invalidate_unpushed_cache(self):
+        """Forget the memoized unpushed commit list"""
+        self._unpushed_cache = None
     
     def get_unpushed_commits(self) -> List[str]:
         """Get list of unpushed commits"""
+        # Reuse the previous answer while the repository state is unchanged
+        key = self._git_state_key()
+        if key is not None and self._unpushed_cache is not None and self._unpushed_cache[0] == key:
+            return list(self._unpushed_cache[1])
+        
+        commits = self._list_unpushed_commits()
+        if key is not None:
+            self._unpushed_cache = (key, commits)
+        return list(commits)
+    
+    def _list_unpushed_commits(self) -> List[str]:
+        """Ask git for the list of unpushed commits"""
+        # Nothing to list when HEAD and origin/main are the same commit
+        # (or either is missing, in which case 'git log' would fail as well)
+        head, remote_head = self._resolve_revisions('HEAD', 'origin/main')
+        if head is None or remote_head is None or head == remote_head:
+            return []
+        
         try:
-            import subprocess
             result = subprocess.run(['git', 'log', 'origin/main..HEAD', '--oneline'], 
                                   cwd=self.vault_path, capture_output=True, text=True, timeout=10)
             
@@ -252,6 +605,13 @@ class OfflineSyncManager:
         2. Previous offline sessions
         3. Network state transitions
         """
+        # Steady state: nothing was unpushed at the last successful sync and the
+        # repository has not changed since, so there is nothing to check
+        if not self.offline_state.has_unpushed_commits and self._n_unresolved == 0:
+            clean_key = _clean_git_keys.get(self.vault_path)
+            if clean_key is not None and clean_key == self._git_state_key():
+                return False
+        
         # Check for unpushed commits
         unpushed_commits = self.get_unpushed_commits()
         if unpushed_commits:
@@ -259,10 +619,8 @@ class OfflineSyncManager:
             return True
         
         # Check for unresolved offline sessions
-        unresolved_sessions = [s for s in self.offline_state.offline_sessions 
-                             if s.requires_conflict_resolution and s.end_time is None]
-        if unresolved_sessions:
-            print(f"[OFFLINE] Found {len(unresolved_sessions)} unresolved offline sessions")
+        if self._n_open_unresolved:
+            print(f"[OFFLINE] Found {self._n_open_unresolved} unresolved offline sessions")
             return True
         
         return False
@@ -295,7 +653,9 @@ class OfflineSyncManager:
             session.backup_id = backup_id
         
         self.offline_state.offline_sessions.append(session)
-        self._save_offline_state()
+        self._sessions_by_id.setdefault(session_id, session)
+        self._count_session(session, 1)
+        self._mark_dirty()
         
         print(f"[OFFLINE] Started sync session: {session_id} (mode: {sync_mode.value})")
         return session_id
@@ -304,17 +664,16 @@ class OfflineSyncManager:
                         local_commits: List[str]) -> bool:
         """End a sync session and determine if conflict resolution is needed"""
         # Find the session
-        session = None
-        for s in self.offline_state.offline_sessions:
-            if s.session_id == session_id:
-                session = s
-                break
+        session = self._sessions_by_id.get(session_id)
         
         if not session:
             print(f"[OFFLINE] Warning: Session {session_id} not found")
             return False
         
+        self._invalidate_unpushed_cache()
+        
         # Update session
+        self._count_session(session, -1)
         session.end_time = datetime.now()
         session.network_end = network_state
         session.local_commits = local_commits
@@ -324,12 +683,15 @@ class OfflineSyncManager:
         if session.sync_mode == SyncMode.OFFLINE_TO_ONLINE and local_commits:
             session.requires_conflict_resolution = True
             print(f"[OFFLINE] Session {session_id} requires conflict resolution")
+        self._count_session(session, 1)
         
         # Update global state
         if local_commits:
             self.offline_state.has_unpushed_commits = True
         
-        self._save_offline_state()
+        # Session boundary: make sure the state is on disk
+        self._mark_dirty(meta=bool(local_commits))
+        self.flush(durable=True)
         
         print(f"[OFFLINE] Ended sync session: {session_id} (final mode: {session.sync_mode.value})")
         return session.requires_conflict_resolution
@@ -337,8 +699,7 @@ class OfflineSyncManager:
     def get_session_summary(self) -> Dict[str, Any]:
         """Get summary of offline sessions for user display"""
         total_sessions = len(self.offline_state.offline_sessions)
-        offline_sessions = len([s for s in self.offline_state.offline_sessions 
-                               if s.sync_mode in [SyncMode.OFFLINE_TO_OFFLINE, SyncMode.OFFLINE_TO_ONLINE]])
+        offline_sessions = self._n_offline_sessions
         
         total_unpushed = len(self.get_unpushed_commits())
         
@@ -352,60 +713,61 @@ class OfflineSyncManager:
     
     def cleanup_resolved_sessions(self, aggressive: bool = False):
         """Clean up resolved sessions to prevent clutter"""
-        resolved_sessions = [s for s in self.offline_state.offline_sessions 
-                           if not s.requires_conflict_resolution and s.end_time is not None]
+        # Split sessions in a single pass
+        unresolved_sessions = []  # still need resolution or still open
+        resolved_sessions = []
+        for session in self.offline_state.offline_sessions:
+            if session.requires_conflict_resolution or session.end_time is None:
+                unresolved_sessions.append(session)
+            else:
+                resolved_sessions.append(session)
         
         if aggressive:
-            # Aggressive cleanup: remove all fully resolved sessions older than 1 hour
-            # or if there are no unpushed commits, remove all resolved sessions
-            current_time = datetime.now()
-            cutoff_time = current_time - timedelta(hours=1)
-            unpushed = self.get_unpushed_commits()
-            
-            if len(unpushed) == 0:
+            # If there are no unpushed commits, remove all resolved sessions
+            if not self.get_unpushed_commits() and resolved_sessions:
                 # No unpushed commits - safe to clean up all resolved sessions
-                sessions_to_remove = resolved_sessions
-                remaining_sessions = [s for s in self.offline_state.offline_sessions 
-                                    if s.requires_conflict_resolution or s.end_time is None]
-                
-                if sessions_to_remove:
-                    self.offline_state.offline_sessions = remaining_sessions
-                    self._save_offline_state()
-                    print(f"[OFFLINE] Aggressively cleaned up {len(sessions_to_remove)} resolved sessions (no unpushed commits)")
-                    return
+                self.offline_state.offline_sessions = unresolved_sessions
+                self._index_sessions()
+                self._mark_dirty()
+                self.flush()
+                print(f"[OFFLINE] Aggressively cleaned up {len(resolved_sessions)} resolved sessions (no unpushed commits)")
+                return
             
-            # Otherwise, clean up sessions older than 1 hour
-            old_sessions = [s for s in resolved_sessions if s.end_time and s.end_time < cutoff_time]
-            if old_sessions:
-                sessions_to_keep = [s for s in self.offline_state.offline_sessions if s not in old_sessions]
-                self.offline_state.offline_sessions = sessions_to_keep
-                self._save_offline_state()
-                print(f"[OFFLINE] Cleaned up {len(old_sessions)} old resolved sessions")
+            # Otherwise, clean up resolved sessions that ended more than 1 hour ago
+            cutoff_time = datetime.now() - timedelta(hours=1)
+            recent_sessions = [session for session in resolved_sessions if session.end_time >= cutoff_time]
+            old_session_count = len(resolved_sessions) - len(recent_sessions)
+            if old_session_count:
+                self.offline_state.offline_sessions = unresolved_sessions + recent_sessions
+                self._index_sessions()
+                self._mark_dirty()
+                self.flush()
+                print(f"[OFFLINE] Cleaned up {old_session_count} old resolved sessions")
                 return
         
         # Regular cleanup: Keep only last 10 resolved sessions
         if len(resolved_sessions) > 10:
-            sessions_to_keep = resolved_sessions[-10:]
-            unresolved_sessions = [s for s in self.offline_state.offline_sessions 
-                                 if s.requires_conflict_resolution or s.end_time is None]
-            
-            self.offline_state.offline_sessions = unresolved_sessions + sessions_to_keep
-            self._save_offline_state()
+            self.offline_state.offline_sessions = unresolved_sessions + resolved_sessions[-10:]
+            self._index_sessions()
+            self._mark_dirty()
+            self.flush()
             print(f"[OFFLINE] Cleaned up old resolved sessions")
     
     def mark_session_resolved(self, session_id: str):
         """Mark a session as resolved after conflict resolution"""
-        for session in self.offline_state.offline_sessions:
-            if session.session_id == session_id:
-                session.requires_conflict_resolution = False
-                break
+        session = self._sessions_by_id.get(session_id)
+        if session:
+            self._count_session(session, -1)
+            session.requires_conflict_resolution = False
+            self._count_session(session, 1)
         
         # Update global state if no more unresolved sessions
-        if not any(s.requires_conflict_resolution for s in self.offline_state.offline_sessions):
+        if self._n_unresolved == 0:
             unpushed = self.get_unpushed_commits()
             self.offline_state.has_unpushed_commits = len(unpushed) > 0
         
-        self._save_offline_state()
+        self._mark_dirty(meta=True)
+        self.flush()
     
     def complete_successful_sync(self):
         """
@@ -414,10 +776,13 @@ class OfflineSyncManager:
         """
         current_time = datetime.now()
         changes_made = False
+        self._invalidate_unpushed_cache()
         
         for session in self.offline_state.offline_sessions:
             if session.end_time is None:
+                self._count_session(session, -1)
                 session.end_time = current_time
+                self._count_session(session, 1)
                 changes_made = True
                 print(f"[OFFLINE] Completed session: {session.session_id}")
         
@@ -425,11 +790,15 @@ class OfflineSyncManager:
         unpushed = self.get_unpushed_commits()
         if len(unpushed) == 0:
             self.offline_state.has_unpushed_commits = False
+            clean_key = self._git_state_key()
+            if clean_key is not None:
+                _clean_git_keys[self.vault_path] = clean_key
             changes_made = True
         
         if changes_made:
-            self._save_offline_state()
+            self._mark_dirty(meta=True)
             print(f"[OFFLINE] All sessions marked as completed - ready for cleanup")
+        self.flush(durable=True)
 
 
 # =============================================================================
@@ -532,13 +901,11 @@ def run_offline_sync(vault_path: str, config_data: Dict[str, str],
     try:
         # Use the existing open_obsidian function
         # This would need to be imported or passed as a parameter
-        import subprocess
-        
         # Simple Obsidian launch - adjust based on platform
-        if os.name == 'nt':  # Windows
-            subprocess.Popen([obsidian_path], cwd=vault_path)
-        else:  # Linux/Mac
-            subprocess.Popen([obsidian_path], cwd=vault_path)
+        # Obsidian gets no handles to our stdio or other open files
+        subprocess.Popen([obsidian_path], cwd=vault_path,
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, close_fds=True)
         
         safe_update_log_func("✅ Obsidian launched. Make your edits and close when finished.")
         
@@ -556,15 +923,13 @@ def run_offline_sync(vault_path: str, config_data: Dict[str, str],
     safe_update_log_func("💾 Committing local changes...")
     
     try:
-        import subprocess
-        
         # Add all changes
         subprocess.run(['git', 'add', '.'], cwd=vault_path, check=True)
         
         # Commit with offline indicator
         commit_msg = f"Offline sync commit - {session_id}"
-        result = subprocess.run(['git', 'commit', '-m', commit_msg], 
-                              cwd=vault_path, capture_output=True, text=True)
+        result = subprocess.run(['git', 'commit', '-m', commit_msg], cwd=vault_path, capture_output=True, text=True)
+        manager._invalidate_unpushed_cache()
         
         local_commits = []
         if result.returncode == 0:
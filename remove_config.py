@@ -21,14 +21,15 @@ or path resolution errors. If this happens, run this Python script to remove any
 existing config file and force the application to run in setup mode again.
 """
 
+import errno
 import os
 import sys
 from pathlib import Path
 
-def get_config_directory():
+def _compute_config_directory():
     """
-    Get the OS-specific application data directory for Ogresync.
-    Same function as used in the main application.
+    Work out the OS-specific application data directory for Ogresync.
+    Same logic as used in the main application.
     """
     if sys.platform == "win32":
         # Windows: Use APPDATA (Roaming)
@@ -47,9 +48,29 @@ def get_config_directory():
     # Fallback to current directory (shouldn't happen in normal usage)
     return os.path.join(os.getcwd(), "config")
 
+# The platform and home directory cannot change while the script runs
+_CONFIG_DIR = _compute_config_directory()
+_CONFIG_FILE = os.path.join(_CONFIG_DIR, "config.txt")
+
+def get_config_directory():
+    """Get the OS-specific application data directory for Ogresync."""
+    return _CONFIG_DIR
+
 def get_config_file_path():
     """Get the full path to the config.txt file."""
-    return os.path.join(get_config_directory(), "config.txt")
+    return _CONFIG_FILE
+
+def _write_report(lines):
+    """Write a block of output lines to stdout in one call."""
+    text = "\n".join(lines) + "\n"
+    if sys.platform == "win32" and not sys.stdout.isatty():
+        # Redirected output on Windows: write UTF-8 bytes straight to the file
+        # descriptor instead of going through the locale codec, which cannot encode
+        # the emoji. Real consoles keep sys.stdout, which writes Unicode natively.
+        sys.stdout.flush()
+        os.write(sys.stdout.fileno(), text.encode('utf-8'))
+    else:
+        sys.stdout.write(text)
 
 def remove_config_file():
     """
@@ -59,124 +80,162 @@ def remove_config_file():
     config_file_path = get_config_file_path()
     config_dir = get_config_directory()
     
-    print(f"Ogresync Config Removal Utility")
-    print(f"================================")
-    print(f"Config directory: {config_dir}")
-    print(f"Config file path: {config_file_path}")
-    print()
-    
-    # Check if config file exists
-    if not os.path.exists(config_file_path):
-        print("✅ Config file does not exist - nothing to remove")
-        return True
+    report = [
+        f"Ogresync Config Removal Utility",
+        f"================================",
+        f"Config directory: {config_dir}",
+        f"Config file path: {config_file_path}",
+        "",
+    ]
     
     try:
-        # Remove the config file
-        os.remove(config_file_path)
-        print("✅ Successfully removed config.txt")
+        # A plain unlink already removes the name atomically; the file is too small
+        # for a rename plus background delete to hide any latency
+        os.unlink(config_file_path)
+        report.append("✅ Successfully removed config.txt")
         
-        # Check if directory is now empty and remove it if so
-        if os.path.exists(config_dir):
-            try:
-                # List all files in the directory
-                remaining_files = [f for f in os.listdir(config_dir) if not f.startswith('.')]
-                if not remaining_files:
-                    os.rmdir(config_dir)
-                    print("✅ Removed empty config directory")
-                else:
-                    print(f"📁 Config directory kept (contains {len(remaining_files)} other files)")
-            except OSError as e:
-                print(f"⚠️  Could not remove config directory: {e}")
+        # Remove the directory too; rmdir itself refuses if anything else is left in it
+        try:
+            os.rmdir(config_dir)
+            report.append("✅ Removed empty config directory")
+        except OSError as e:
+            if e.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                report.append("📁 Config directory kept (contains other files)")
+            else:
+                report.append(f"⚠️  Could not remove config directory: {e}")
         
-        return True
+        success = True
         
+    except FileNotFoundError:
+        report.append("✅ Config file does not exist - nothing to remove")
+        success = True
+    except PermissionError:
+        report.append("❌ Failed to remove config file: permission denied (is the file open in another program?)")
+        success = False
+    except IsADirectoryError:
+        report.append("❌ Failed to remove config file: the path is a directory")
+        success = False
     except OSError as e:
-        print(f"❌ Failed to remove config file: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
+        report.append(f"❌ Failed to remove config file: {e}")
+        success = False
+    
+    _write_report(report)
+    return success
 
 def list_config_info():
-    """Display information about the current config setup."""
+    """Display information about the current config setup. Always returns True."""
     config_file_path = get_config_file_path()
     config_dir = get_config_directory()
     
-    print(f"Ogresync Config Information")
-    print(f"===========================")
-    print(f"Operating System: {sys.platform}")
-    print(f"Config directory: {config_dir}")
-    print(f"Config file path: {config_file_path}")
-    print()
+    report = [
+        f"Ogresync Config Information",
+        f"===========================",
+        f"Operating System: {sys.platform}",
+        f"Config directory: {config_dir}",
+        f"Config file path: {config_file_path}",
+        "",
+    ]
     
-    # Check directory existence
-    if os.path.exists(config_dir):
-        print(f"✅ Config directory exists")
+    # Check directory existence, keeping the config file's stat from the same listing
+    config_file_stat = None
+    try:
+        with os.scandir(config_dir) as entries:
+            files = []
+            for entry in entries:
+                files.append(entry.name)
+                if entry.name == "config.txt":
+                    config_file_stat = entry.stat()
+        report.append(f"✅ Config directory exists")
+        if files:
+            report.append(f"📁 Directory contents: {', '.join(files)}")
+        else:
+            report.append(f"📁 Directory is empty")
+    except FileNotFoundError:
+        report.append(f"❌ Config directory does not exist")
+    except OSError as e:
+        report.append(f"✅ Config directory exists")
+        report.append(f"⚠️  Cannot list directory contents: {e}")
         try:
-            files = os.listdir(config_dir)
-            if files:
-                print(f"📁 Directory contents: {', '.join(files)}")
-            else:
-                print(f"📁 Directory is empty")
-        except OSError as e:
-            print(f"⚠️  Cannot list directory contents: {e}")
-    else:
-        print(f"❌ Config directory does not exist")
+            config_file_stat = os.stat(config_file_path)
+        except OSError:
+            pass
     
     # Check file existence
-    if os.path.exists(config_file_path):
-        print(f"✅ Config file exists")
+    if config_file_stat is not None:
+        report.append(f"✅ Config file exists")
         try:
-            file_size = os.path.getsize(config_file_path)
-            print(f"📄 File size: {file_size} bytes")
+            report.append(f"📄 File size: {config_file_stat.st_size} bytes")
             
-            # Try to read the file content (first few lines)
-            with open(config_file_path, 'r', encoding='utf-8') as f:
-                content = f.read(500)  # Read first 500 characters
-                lines = content.splitlines()
-                print(f"📄 Content preview (first {min(3, len(lines))} lines):")
-                for i, line in enumerate(lines[:3]):
-                    print(f"   {i+1}: {line}")
-                if len(lines) > 3:
-                    print(f"   ... ({len(lines)} total lines)")
+            # Try to read the file content (first few lines). The config is only a few
+            # lines, so read it with one os.read() sized from the stat we already have
+            fd = os.open(config_file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                data = os.read(fd, config_file_stat.st_size)
+            finally:
+                os.close(fd)
+            lines = data.decode('utf-8', errors='replace').splitlines()
+            report.append(f"📄 Content preview (first {min(3, len(lines))} lines):")
+            for i, line in enumerate(lines[:3]):
+                report.append(f"   {i+1}: {line}")
+            if len(lines) > 3:
+                report.append(f"   ... ({len(lines)} total lines)")
         except Exception as e:
-            print(f"⚠️  Cannot read file: {e}")
+            report.append(f"⚠️  Cannot read file: {e}")
     else:
-        print(f"❌ Config file does not exist")
+        report.append(f"❌ Config file does not exist")
+    
+    _write_report(report)
+    return True
+
+def show_help():
+    """Print usage information."""
+    _write_report([
+        f"Ogresync Config Utility",
+        f"Usage: python {sys.argv[0]} [command]",
+        f"",
+        f"Commands:",
+        f"  remove, delete, rm  - Remove the config.txt file",
+        f"  info, list, show    - Show config file information",
+        f"  help                - Show this help message",
+        f"",
+        f"If no command is given, defaults to 'remove'",
+    ])
+    return True
+
+# Command-line aliases mapped to their handlers; each handler returns True on success
+_COMMANDS = {
+    'remove': remove_config_file,
+    'delete': remove_config_file,
+    'rm': remove_config_file,
+    'info': list_config_info,
+    'list': list_config_info,
+    'show': list_config_info,
+    'help': show_help,
+    '-h': show_help,
+    '--help': show_help,
+}
 
 def main():
     """Main function with command-line interface."""
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
-        
-        if command in ['remove', 'delete', 'rm']:
-            success = remove_config_file()
-            sys.exit(0 if success else 1)
-        elif command in ['info', 'list', 'show']:
-            list_config_info()
-            sys.exit(0)
-        elif command in ['help', '-h', '--help']:
-            print(f"Ogresync Config Utility")
-            print(f"Usage: python {sys.argv[0]} [command]")
-            print(f"")
-            print(f"Commands:")
-            print(f"  remove, delete, rm  - Remove the config.txt file")
-            print(f"  info, list, show    - Show config file information")
-            print(f"  help                - Show this help message")
-            print(f"")
-            print(f"If no command is given, defaults to 'remove'")
-            sys.exit(0)
-        else:
-            print(f"❌ Unknown command: {command}")
-            print(f"Use 'python {sys.argv[0]} help' for usage information")
+        handler = _COMMANDS.get(command)
+        if handler is None:
+            _write_report([
+                f"❌ Unknown command: {command}",
+                f"Use 'python {sys.argv[0]} help' for usage information",
+            ])
             sys.exit(1)
     else:
         # Default action: remove config file
-        print("No command specified - defaulting to 'remove'")
-        print("Use 'python remove_config.py help' for other options")
-        print()
-        success = remove_config_file()
-        sys.exit(0 if success else 1)
+        _write_report([
+            "No command specified - defaulting to 'remove'",
+            "Use 'python remove_config.py help' for other options",
+            "",
+        ])
+        handler = remove_config_file
+    
+    sys.exit(0 if handler() else 1)
 
 if __name__ == "__main__":
     main()
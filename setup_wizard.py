@@ -17,63 +17,280 @@ robust error handling, and seamless integration with the enhanced conflict resol
 import os
 import sys
 import re
+import json
 import platform
-import webbrowser
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, simpledialog
 import threading
 import time
+import shutil
 import subprocess
-from typing import Optional, Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+import importlib
+from importlib.util import find_spec
+from typing import Optional, Tuple, Dict, Any, NamedTuple
 
-# Optional imports
-try:
-    import pyperclip
-except ImportError:
-    pyperclip = None
+# tkinter and the optional Ogresync modules are imported by _load_wizard_dependencies()
+# when a wizard is created, so importing this module does not load the GUI stack.
+# Until then these names are not defined; reading one from outside the module
+# loads them through the module __getattr__ below.
+_LAZY_NAMES = frozenset((
+    'tk', 'ttk', 'tkfont', 'messagebox', 'filedialog', 'simpledialog', 'webbrowser', 'pyperclip',
+    'ui_elements', 'Stage1_conflict_resolution', 'stage2_conflict_resolution',
+    'ConflictStrategy', 'CONFLICT_RESOLUTION_AVAILABLE', 'Ogresync',
+    'OgresyncBackupManager', 'BackupReason', 'BACKUP_MANAGER_AVAILABLE', 'pygit2',
+))
+_wizard_dependencies_loaded = False
 
-# Import our modules - handle import gracefully
-try:
-    import ui_elements
-except ImportError:
-    ui_elements = None
+def __getattr__(name):
+    """Load the wizard dependencies the first time one of them is read as a module attribute (PEP 562)."""
+    if name in _LAZY_NAMES:
+        _load_wizard_dependencies()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    import Stage1_conflict_resolution
-    import stage2_conflict_resolution
-    from Stage1_conflict_resolution import ConflictStrategy
-    CONFLICT_RESOLUTION_AVAILABLE = True
-except ImportError:
-    Stage1_conflict_resolution = None
-    stage2_conflict_resolution = None
-    ConflictStrategy = None
-    CONFLICT_RESOLUTION_AVAILABLE = False
+def _load_wizard_dependencies():
+    """Import tkinter and the optional modules used by the wizard (only the first call does work)."""
+    global tk, ttk, tkfont, messagebox, filedialog, simpledialog, webbrowser, pyperclip, ui_elements
+    global Stage1_conflict_resolution, stage2_conflict_resolution, ConflictStrategy, CONFLICT_RESOLUTION_AVAILABLE
+    global Ogresync, OgresyncBackupManager, BackupReason, BACKUP_MANAGER_AVAILABLE, pygit2
+    global _wizard_dependencies_loaded
+    if _wizard_dependencies_loaded:
+        return
+    
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog, simpledialog
+    from tkinter import font as tkfont
+    import webbrowser
+    _wizard_dependencies_loaded = True
+    
+    pyperclip = ui_elements = Ogresync = pygit2 = None
+    Stage1_conflict_resolution = stage2_conflict_resolution = ConflictStrategy = None
+    OgresyncBackupManager = BackupReason = None
+    CONFLICT_RESOLUTION_AVAILABLE = BACKUP_MANAGER_AVAILABLE = False
+    
+    # Optional imports. find_spec() skips modules that are not installed without
+    # running a failing import; present modules can still fail on their own imports.
+    if find_spec("pyperclip") is not None:
+        try:
+            import pyperclip
+        except ImportError:
+            pyperclip = None
+    
+    # Import our modules - handle import gracefully
+    if find_spec("ui_elements") is not None:
+        try:
+            import ui_elements
+        except ImportError:
+            ui_elements = None
+    
+    if find_spec("Stage1_conflict_resolution") is not None and find_spec("stage2_conflict_resolution") is not None:
+        try:
+            import Stage1_conflict_resolution
+            import stage2_conflict_resolution
+            from Stage1_conflict_resolution import ConflictStrategy
+            CONFLICT_RESOLUTION_AVAILABLE = True
+        except ImportError:
+            Stage1_conflict_resolution = None
+            stage2_conflict_resolution = None
+            ConflictStrategy = None
+            CONFLICT_RESOLUTION_AVAILABLE = False
+    
+    if find_spec("Ogresync") is not None:
+        try:
+            import Ogresync
+        except ImportError:
+            Ogresync = None
+    
+    # Import backup manager
+    if find_spec("backup_manager") is not None:
+        try:
+            from backup_manager import OgresyncBackupManager, BackupReason
+            BACKUP_MANAGER_AVAILABLE = True
+        except ImportError:
+            OgresyncBackupManager = None
+            BackupReason = None
+            BACKUP_MANAGER_AVAILABLE = False
+    
+    # libgit2 bindings: when installed, remote configuration runs in-process instead of
+    # starting git for each command
+    if find_spec("pygit2") is not None:
+        try:
+            import pygit2
+        except ImportError:
+            pygit2 = None
+
+# Bundled assets: inside the PyInstaller bundle when frozen, next to this file otherwise
+_BUNDLE_DIR = getattr(sys, '_MEIPASS', None) or os.path.dirname(os.path.abspath(__file__))
+_ASSETS_DIR = os.path.join(_BUNDLE_DIR, "assets")
+
+# Window icon candidates, in order of preference
+_WINDOW_ICON_FILES = ("new_logo_1.ico", "ogrelix_logo.ico", "new_logo_1.png")
+
+# Icon file that worked for the first wizard dialog, reused by later ones
+_window_icon_path = None
+
+# Default SSH key and known_hosts locations used by the SSH steps
+_SSH_DIR = os.path.expanduser(os.path.join("~", ".ssh"))
+_SSH_PRIVKEY_BASE = os.path.join(_SSH_DIR, "id_rsa")
+_SSH_PUBKEY_PATH = _SSH_PRIVKEY_BASE + ".pub"
+_SSH_KNOWN_HOSTS_PATH = os.path.join(_SSH_DIR, "known_hosts")
+
+# Extra subprocess arguments for every command the wizard runs: on Windows the child
+# processes get no console window, which would otherwise flash up for each git call
+_POPEN_KW: Dict[str, Any] = {}
+if sys.platform == "win32":
+    _startupinfo = subprocess.STARTUPINFO()
+    _startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _POPEN_KW["startupinfo"] = _startupinfo
+    _POPEN_KW["creationflags"] = subprocess.CREATE_NO_WINDOW
+    del _startupinfo
+
+# Executables the wizard steps look up, found in the background when the wizard starts
+_PREFETCHED_TOOLS = ("git", "ssh-keygen", "ssh-keyscan")
+
+# File in the Ogresync config directory remembering where earlier wizard runs found
+# Obsidian and Git, see OgresyncSetupWizard._cached_probe()
+_WIZARD_CACHE_FILE = "wizard_cache.json"
+
+# Marks a name looked up in a module but not found
+_MISSING = object()
+
+def _read_auto_advance_delay_ms():
+    """Pause before the wizard moves on to the next step, from OGRESYNC_WIZARD_DELAY_MS."""
+    try:
+        return max(0, int(os.environ.get("OGRESYNC_WIZARD_DELAY_MS", 1500)))
+    except ValueError:
+        return 1500
+
+# Pause (ms) that lets the user see a step's result before the next one starts;
+# set OGRESYNC_WIZARD_DELAY_MS=0 for unattended runs
+_AUTO_ADVANCE_DELAY_MS = _read_auto_advance_delay_ms()
+
+# Steps that took at least this long (seconds) were already on screen long enough,
+# so the wizard advances straight away after them
+_MIN_VISIBLE_STEP_SECONDS = 0.05
+
+# Helper modules used through the _safe_*_call methods, imported on first use
+# (None records a module that could not be imported)
+_helper_modules: Dict[str, Any] = {}
 
-try:
-    import Ogresync
-except ImportError:
-    Ogresync = None
+def _get_helper_module(name):
+    """Return the named helper module (github_setup, wizard_steps), importing it only once."""
+    try:
+        return _helper_modules[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _helper_modules[name] = module
+    return module
+
+def _count_content_files(vault_path):
+    """
+    Count the non-hidden files in a vault, leaving out everything under .git.
+    Git lists the files when the vault is a repository (tracked files plus untracked
+    ones that are not ignored); otherwise the directory tree is scanned.
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+            cwd=vault_path, capture_output=True, **_POPEN_KW
+        )
+    except OSError:
+        result = None
+    if result is None or result.returncode != 0:
+        return _scan_content_files(vault_path)
+    
+    count = 0
+    for path in result.stdout.split(b'\0'):
+        if path and not path.rpartition(b'/')[2].startswith(b'.'):
+            count += 1
+    return count
+
+def _scan_content_files(vault_path):
+    """
+    Count the non-hidden files under vault_path by walking it, leaving out .git.
+    Unreadable directories are skipped, as os.walk() would.
+    """
+    count = 0
+    pending_dirs = [vault_path]
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    # The dirent type answers these checks without a stat for regular entries
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '.git':
+                            pending_dirs.append(entry.path)
+                    elif not entry.name.startswith('.') and not entry.is_dir():
+                        count += 1
+        except OSError:
+            continue
+    return count
+
+def _git_init_main(vault_path):
+    """
+    Create a Git repository in vault_path whose first branch is main.
+    Returns the CompletedProcess of the git init that ran.
+    """
+    # git 2.28+ names the initial branch in the same process
+    result = subprocess.run(['git', 'init', '--initial-branch=main'],
+                            cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
+    if result.returncode != 0:
+        # Older git rejects the option: init, then rename the branch
+        result = subprocess.run(['git', 'init'], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
+        if result.returncode == 0:
+            subprocess.run(['git', 'branch', '-M', 'main'], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
+    return result
 
-# Import backup manager
-try:
-    from backup_manager import OgresyncBackupManager, BackupReason
-    BACKUP_MANAGER_AVAILABLE = True
-except ImportError:
-    OgresyncBackupManager = None
-    BackupReason = None
-    BACKUP_MANAGER_AVAILABLE = False
+def _git_commit_staged(vault_path, message):
+    """
+    Commit whatever is staged in vault_path, as one of the wizard's setup commits.
+    Returns (committed, error): (False, None) when nothing was staged, and
+    (False, git's error output) when the commit failed.
+    """
+    # diff --quiet exits 0 when the index matches HEAD, i.e. there is nothing to commit
+    if subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=vault_path, **_POPEN_KW).returncode == 0:
+        return False, None
+    # These are the wizard's own bootstrap commits: skip hooks and commit signing
+    result = subprocess.run(['git', '-c', 'commit.gpgsign=false', 'commit', '--no-verify', '-m', message],
+                            cwd=vault_path,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, **_POPEN_KW)
+    if result.returncode == 0:
+        return True, None
+    return False, result.stderr
 
 # =============================================================================
 # SETUP WIZARD STEP DEFINITION
 # =============================================================================
 
+class StepStatus(IntEnum):
+    """Progress state of a setup wizard step."""
+    PENDING = 0
+    RUNNING = 1
+    SUCCESS = 2
+    ERROR = 3
+
+# Icon shown for each StepStatus, and its color in the steps list, indexed by its value
+_STEP_STATUS_ICONS = ("⚪", "🔄", "✅", "❌")
+_STEP_STATUS_COLORS = ("#6B7280", "#F59E0B", "#10B981", "#EF4444")  # gray, orange, green, red
+
+# Status bar message template and color for a step that finished with the given status
+_STEP_RESULT_MESSAGES = {
+    StepStatus.SUCCESS: ("✅ %s completed successfully", "#10B981"),
+    StepStatus.ERROR: ("❌ %s failed: %s", "#EF4444"),
+}
+
 class SetupWizardStep:
     """Represents a single step in the setup wizard."""
-    def __init__(self, title, description, icon="⚪", status="pending"):
+    __slots__ = ('title', 'description', 'status', 'error_message')
+    
+    def __init__(self, title, description, status=StepStatus.PENDING):
         self.title = title
         self.description = description
-        self.icon = icon
-        self.status = status  # "pending", "running", "success", "error"
+        self.status = status
         self.error_message = ""
     
     def set_status(self, status, error_message=""):
@@ -81,14 +298,238 @@ class SetupWizardStep:
         self.error_message = error_message
     
     def get_status_icon(self):
-        if self.status == "success":
-            return "✅"
-        elif self.status == "error":
-            return "❌"
-        elif self.status == "running":
-            return "🔄"
+        return _STEP_STATUS_ICONS[self.status]
+
+class _StepWidgets(NamedTuple):
+    """The Tk widgets that display one setup step."""
+    container: Any
+    frame: Any
+    icon: Any
+    title: Any
+    description: Any
+    error: Any
+
+# =============================================================================
+# COMPLETION DIALOG TEXTS
+# =============================================================================
+
+_COMPLETION_TEXT = (
+    "Congratulations! Your Ogresync setup is now complete.\n\n"
+    "✅ Obsidian vault is configured\n"
+    "✅ Git repository is initialized\n"
+    "✅ GitHub integration is active\n"
+    "✅ SSH keys are configured\n\n"
+    "Your notes are now synchronized with GitHub and ready for seamless editing!"
+)
+
+_NEXT_STEPS_TEXT = (
+    "• Ogresync will now switch to sync mode\n"
+    "• Use the sync interface to keep your notes updated\n"
+    "• Your changes will automatically sync with GitHub\n"
+    "• Collaborate with others by sharing your repository"
+)
+
+_CONFIG_SUMMARY_TEMPLATE = """Configuration Summary:
+
+📁 Vault Path: {VAULT_PATH}
+🔧 Obsidian Path: {OBSIDIAN_PATH}
+🌐 GitHub Repository: {GITHUB_REMOTE_URL}
+✅ Setup Status: {SETUP_STATUS}
+
+Your configuration has been saved and Ogresync is ready to use!"""
+
+class _ConfigSummaryValues(dict):
+    """Config values for _CONFIG_SUMMARY_TEMPLATE; missing keys read as 'Not set'."""
+    def __missing__(self, key):
+        return 'Not set'
+
+# =============================================================================
+# FALLBACK MANUAL SSH DIALOG
+# =============================================================================
+
+class _FallbackSshDialog:
+    """
+    Manual SSH setup dialog used when ui_elements is not available.
+    The widgets are built once; closing the dialog hides it so that later
+    SSH test retries only have to swap in the current key.
+    """
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.ssh_key_content = ""
+        
+        dialog = self.window = tk.Toplevel(parent)
+        dialog.title("Manual SSH Setup Required")
+        dialog.transient(parent)
+        dialog.geometry("850x800")  # Increased size to accommodate all elements and buttons
+        dialog.configure(bg="#FAFBFC")
+        dialog.resizable(True, True)  # Allow resizing
+        dialog.protocol("WM_DELETE_WINDOW", self.hide)
+        
+        # Main frame
+        main_frame = tk.Frame(dialog, bg="#FAFBFC")
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Title
+        title_label = tk.Label(
+            main_frame,
+            text="🔑 Manual SSH Setup Required",
+            font=("Arial", 16, "bold"),
+            bg="#FAFBFC",
+            fg="#1E293B"
+        )
+        title_label.pack(pady=(0, 20))
+        
+        # Instructions
+        instructions = (
+            "SSH connection to GitHub failed. Please follow these steps:\n\n"
+            "1. Copy your SSH key below (click 'Copy SSH Key')\n"
+            "2. Go to GitHub.com → Settings → SSH and GPG keys\n"
+            "3. Click 'New SSH key'\n"
+            "4. Paste your key and give it a title (e.g., 'Ogresync Key')\n"
+            "5. Click 'Add SSH key'\n"
+            "6. Return to Ogresync and click 'Execute: Test SSH' to continue\n\n"
+            "After adding the key to GitHub, the SSH test should pass."
+        )
+        
+        instr_label = tk.Label(
+            main_frame,
+            text=instructions,
+            font=("Arial", 11),
+            bg="#FAFBFC",
+            fg="#475569",
+            justify=tk.LEFT,
+            wraplength=700
+        )
+        instr_label.pack(pady=(0, 20))
+        
+        # SSH Key display (only packed while there is a key to show, see show())
+        self.key_frame = tk.LabelFrame(
+            main_frame,
+            text="Your SSH Public Key",
+            font=("Arial", 10, "bold"),
+            bg="#FAFBFC",
+            fg="#1E293B",
+            padx=10,
+            pady=10
+        )
+        
+        # Create a scrollable text widget for the SSH key
+        key_scroll_frame = tk.Frame(self.key_frame, bg="#F8F9FA")
+        key_scroll_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.key_text = tk.Text(
+            key_scroll_frame,
+            height=8,  # Increased height to show full key
+            wrap=tk.WORD,
+            font=("Courier", 9),
+            bg="#F8F9FA",
+            fg="#1E293B",
+            relief=tk.FLAT,
+            borderwidth=1
+        )
+        
+        # Add scrollbar for the text widget
+        scrollbar = tk.Scrollbar(key_scroll_frame, orient=tk.VERTICAL, command=self.key_text.yview)
+        self.key_text.configure(yscrollcommand=scrollbar.set)
+        
+        self.key_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Buttons frame with increased spacing
+        self.button_frame = tk.Frame(main_frame, bg="#FAFBFC")
+        self.button_frame.pack(fill=tk.X, pady=(20, 0))
+        
+        # Copy button
+        copy_btn = tk.Button(
+            self.button_frame,
+            text="📋 Copy SSH Key",
+            command=self.copy_ssh_key,
+            font=("Arial", 10, "bold"),
+            bg="#6366F1",
+            fg="#FFFFFF",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=12
+        )
+        copy_btn.pack(side=tk.LEFT, padx=(0, 12))
+        
+        # GitHub button - direct link to add SSH key page
+        github_btn = tk.Button(
+            self.button_frame,
+            text="🌐 Add SSH Key to GitHub",
+            command=self.open_github,
+            font=("Arial", 10, "bold"),
+            bg="#22C55E",
+            fg="#FFFFFF",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=12
+        )
+        github_btn.pack(side=tk.LEFT, padx=(0, 12))
+        
+        # Close button
+        close_btn = tk.Button(
+            self.button_frame,
+            text="Close",
+            command=self.hide,
+            font=("Arial", 10, "normal"),
+            bg="#EF4444",
+            fg="#FFFFFF",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=20,
+            pady=12
+        )
+        close_btn.pack(side=tk.RIGHT)
+    
+    def exists(self):
+        """Whether the dialog's window is still alive (it dies with its parent)."""
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+    
+    def show(self, ssh_key_content):
+        """Display the dialog with the given public key."""
+        if ssh_key_content != self.ssh_key_content:
+            # Replace the key text in one call; the widget is kept read-only otherwise
+            self.key_text.config(state=tk.NORMAL)
+            self.key_text.replace("1.0", tk.END, ssh_key_content)
+            self.key_text.config(state=tk.DISABLED)
+            self.ssh_key_content = ssh_key_content
+        
+        if ssh_key_content:
+            self.key_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20), before=self.button_frame)
         else:
-            return "⚪"
+            self.key_frame.pack_forget()
+        
+        self.window.deiconify()
+        self.window.lift()
+        self.window.grab_set()
+    
+    def hide(self):
+        """Hide the dialog so the next show() can reuse it."""
+        self.window.grab_release()
+        self.window.withdraw()
+    
+    def copy_ssh_key(self):
+        if pyperclip is not None:
+            pyperclip.copy(self.ssh_key_content)
+            if ui_elements:
+                ui_elements.show_premium_info("Success", "SSH key copied to clipboard!", self.window)
+            else:
+                messagebox.showinfo("Success", "SSH key copied to clipboard!")
+        else:
+            if ui_elements:
+                ui_elements.show_premium_error("Error", "Could not copy to clipboard. Please copy manually.", self.window)
+            else:
+                messagebox.showerror("Error", "Could not copy to clipboard. Please copy manually.")
+    
+    def open_github(self):
+        webbrowser.open("https://github.com/settings/ssh/new")  # Direct link to add SSH key page
 
 # =============================================================================
 # MAIN SETUP WIZARD CLASS
@@ -98,23 +539,38 @@ class OgresyncSetupWizard:
     """Main setup wizard class that orchestrates the 11-step setup process."""
     
     def __init__(self, parent=None):
+        _load_wizard_dependencies()
         self.parent = parent
         self.dialog = None
         
         # Define all setup steps
         self.setup_steps = [
-            SetupWizardStep("Obsidian Checkup", "Verify Obsidian installation", "🔍"),
-            SetupWizardStep("Git Check", "Verify Git installation", "🔧"),
-            SetupWizardStep("Choose Vault", "Select Obsidian vault folder", "📁"),
-            SetupWizardStep("Initialize Git", "Setup Git repository in vault", "📋"),
-            SetupWizardStep("SSH Key Setup", "Generate or verify SSH key", "🔑"),
-            SetupWizardStep("Known Hosts", "Add GitHub to known hosts", "🌐"),
-            SetupWizardStep("Test SSH", "Test SSH connection to GitHub (manual step)", "🔐"),
-            SetupWizardStep("GitHub Repository", "Link GitHub repository", "🔗"),
-            SetupWizardStep("Repository Sync", "Enhanced two-stage conflict resolution", "⚖️"),
-            SetupWizardStep("Final Sync", "Intelligent synchronization with safeguards", "📥"),
-            SetupWizardStep("Complete Setup", "Finalize configuration", "🎉")
+            SetupWizardStep("Obsidian Checkup", "Verify Obsidian installation"),
+            SetupWizardStep("Git Check", "Verify Git installation"),
+            SetupWizardStep("Choose Vault", "Select Obsidian vault folder"),
+            SetupWizardStep("Initialize Git", "Setup Git repository in vault"),
+            SetupWizardStep("SSH Key Setup", "Generate or verify SSH key"),
+            SetupWizardStep("Known Hosts", "Add GitHub to known hosts"),
+            SetupWizardStep("Test SSH", "Test SSH connection to GitHub (manual step)"),
+            SetupWizardStep("GitHub Repository", "Link GitHub repository"),
+            SetupWizardStep("Repository Sync", "Enhanced two-stage conflict resolution"),
+            SetupWizardStep("Final Sync", "Intelligent synchronization with safeguards"),
+            SetupWizardStep("Complete Setup", "Finalize configuration")
         ]
+        # Function run for each step, in the same order as setup_steps
+        self._step_functions = (
+            self._step_obsidian_checkup,
+            self._step_git_check,
+            self._step_choose_vault,
+            self._step_initialize_git,
+            self._step_ssh_key_setup,
+            self._step_known_hosts,
+            self._step_test_ssh,
+            self._step_github_repository,
+            self._step_repository_sync,
+            self._step_final_sync,
+            self._step_complete_setup
+        )
           # State management
         self.wizard_state = {
             "current_step": 0,
@@ -124,60 +580,76 @@ class OgresyncSetupWizard:
             "obsidian_path": "",
             "github_url": "",
             "setup_complete": False,
-            "conflict_resolution_strategy": None  # Track the chosen strategy
+            "conflict_resolution_strategy": None,  # Track the chosen strategy
+            "tool_paths": {},  # Executables found by _resolve_tool(), None if not on PATH
+            "git_repo_state": {}  # Per vault path, see _git_repo_state()
         }
         
-        # UI components
-        self.step_widgets = []
+        # Ogresync functions resolved by _safe_ogresync_call() (_MISSING if absent), and
+        # whether each attribute written by _safe_ogresync_set() exists
+        self._ogresync_method_cache: Dict[str, Any] = {}
+        self._ogresync_settable_cache: Dict[str, bool] = {}
+        # Helper module functions resolved by _safe_helper_call(), keyed by
+        # (module name, function name); _MISSING if the module lacks the function
+        self._helper_method_cache: Dict[Tuple[str, str], Any] = {}
+        
+        # UI components; one _StepWidgets per step, indexed like setup_steps
+        self._step_widgets = []
+        # Status each step's icon was last drawn with (None until first drawn)
+        self._last_rendered_status = [None] * len(self.setup_steps)
         self.status_label = None
         self.button_container = None
+        self._screen_size = None  # (width, height), see _get_screen_size()
+        self._fallback_ssh_dialog = None  # _FallbackSshDialog, built on first use
+        self._cached_ssh_pubkey = None  # Contents of the public key, see _get_ssh_pubkey()
+        self._tool_path_futures = {}  # Background PATH lookups, see _prefetch_tool_paths()
+        self._probe_cache = None  # Contents of _WIZARD_CACHE_FILE, loaded on first use
+        self._ssh_dir_ensured = False  # Set once _ensure_ssh_dir() has created/found ~/.ssh
+        self._pygit2_repos = {}  # pygit2.Repository per vault path, see _pygit2_repository()
+        self._accessible_repo_urls = set()  # URLs _test_repository_access() reached
     
     def _safe_ogresync_call(self, method_name, *args, **kwargs):
         """Safely call an Ogresync method with error handling."""
-        if not Ogresync:
-            return None, "Ogresync module not available"
-        
-        if not hasattr(Ogresync, method_name):
+        method = self._ogresync_method_cache.get(method_name)
+        if method is None:
+            # First call for this name: the module check and lookup only happen here
+            if not Ogresync:
+                return None, "Ogresync module not available"
+            method = getattr(Ogresync, method_name, _MISSING)
+            self._ogresync_method_cache[method_name] = method
+        if method is _MISSING:
             return None, f"Method '{method_name}' not available in Ogresync module"
         
         try:
-            method = getattr(Ogresync, method_name)
-            result = method(*args, **kwargs)
-            return result, None
+            return method(*args, **kwargs), None
         except Exception as e:
             return None, str(e)
         
-    def _safe_github_setup_call(self, method_name, *args, **kwargs):
-        """Safely call a GitHub setup method with error handling."""
+    def _safe_helper_call(self, module_name, method_name, args, kwargs):
+        """Safely call a function of a helper module, resolving it only on the first call."""
+        key = (module_name, method_name)
+        method = self._helper_method_cache.get(key)
+        if method is None:
+            module = _get_helper_module(module_name)
+            if module is None:
+                return None, f"{module_name} module not available"
+            method = getattr(module, method_name, _MISSING)
+            self._helper_method_cache[key] = method
+        if method is _MISSING:
+            return None, f"Method '{method_name}' not available in {module_name} module"
+        
         try:
-            import github_setup
-            
-            if not hasattr(github_setup, method_name):
-                return None, f"Method '{method_name}' not available in github_setup module"
-            
-            method = getattr(github_setup, method_name)
-            result = method(*args, **kwargs)
-            return result, None
-        except ImportError:
-            return None, "github_setup module not available"
+            return method(*args, **kwargs), None
         except Exception as e:
             return None, str(e)
+    
+    def _safe_github_setup_call(self, method_name, *args, **kwargs):
+        """Safely call a GitHub setup method with error handling."""
+        return self._safe_helper_call("github_setup", method_name, args, kwargs)
 
     def _safe_wizard_steps_call(self, method_name, *args, **kwargs):
         """Safely call a wizard steps method with error handling."""
-        try:
-            import wizard_steps
-            
-            if not hasattr(wizard_steps, method_name):
-                return None, f"Method '{method_name}' not available in wizard_steps module"
-            
-            method = getattr(wizard_steps, method_name)
-            result = method(*args, **kwargs)
-            return result, None
-        except ImportError:
-            return None, "wizard_steps module not available"
-        except Exception as e:
-            return None, str(e)
+        return self._safe_helper_call("wizard_steps", method_name, args, kwargs)
     
     
     def _safe_ogresync_get(self, attr_name):
@@ -192,61 +664,51 @@ class OgresyncSetupWizard:
         if not Ogresync:
             return False
         
-        if hasattr(Ogresync, attr_name):
+        has_attr = self._ogresync_settable_cache.get(attr_name)
+        if has_attr is None:
+            has_attr = self._ogresync_settable_cache[attr_name] = hasattr(Ogresync, attr_name)
+        if has_attr:
             setattr(Ogresync, attr_name, value)
             return True
         return False
     
     def _set_window_icon(self):
         """Set window icon for the dialog"""
+        global _window_icon_path
         if not self.dialog:
             return
             
         try:
-            # Try to find icon files
-            icon_paths = []
-            
-            # Check if we're running from a PyInstaller bundle
-            if hasattr(sys, '_MEIPASS'):
-                # Running from PyInstaller bundle
-                bundle_dir = sys._MEIPASS
-                icon_paths.extend([
-                    os.path.join(bundle_dir, "assets", "new_logo_1.ico"),
-                    os.path.join(bundle_dir, "assets", "ogrelix_logo.ico"),
-                    os.path.join(bundle_dir, "assets", "new_logo_1.png")
-                ])
-            else:
-                # Running from source
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                icon_paths.extend([
-                    os.path.join(script_dir, "assets", "new_logo_1.ico"),
-                    os.path.join(script_dir, "assets", "ogrelix_logo.ico"),
-                    os.path.join(script_dir, "assets", "new_logo_1.png")
-                ])
+            # Reuse the icon found for an earlier dialog
+            if _window_icon_path and self._apply_window_icon(_window_icon_path):
+                return
             
             # Try to set icon from available files
-            for icon_path in icon_paths:
-                if os.path.exists(icon_path):
-                    try:
-                        if icon_path.lower().endswith('.ico'):
-                            self.dialog.iconbitmap(icon_path)
-                        elif icon_path.lower().endswith('.png'):
-                            # For PNG files, try to load as PhotoImage
-                            try:
-                                icon_image = tk.PhotoImage(file=icon_path)
-                                self.dialog.iconphoto(True, icon_image)
-                            except Exception:
-                                pass  # If PNG loading fails, continue to next icon
-                        print(f"[DEBUG] Successfully set window icon: {icon_path}")
-                        break
-                    except Exception as e:
-                        print(f"[DEBUG] Failed to set icon {icon_path}: {e}")
-                        continue
+            for icon_name in _WINDOW_ICON_FILES:
+                icon_path = os.path.join(_ASSETS_DIR, icon_name)
+                if os.path.isfile(icon_path) and self._apply_window_icon(icon_path):
+                    _window_icon_path = icon_path
+                    print(f"[DEBUG] Successfully set window icon: {icon_path}")
+                    break
                         
         except Exception as e:
             print(f"[DEBUG] Icon loading failed: {e}")
             pass  # Icon is optional, don't break the dialog
     
+    def _apply_window_icon(self, icon_path):
+        """Set the dialog icon from an .ico or .png file; returns True on success."""
+        try:
+            if icon_path.lower().endswith('.ico'):
+                self.dialog.iconbitmap(icon_path)
+            else:
+                # For PNG files, load as PhotoImage
+                icon_image = tk.PhotoImage(file=icon_path)
+                self.dialog.iconphoto(True, icon_image)
+            return True
+        except Exception as e:
+            print(f"[DEBUG] Failed to set icon {icon_path}: {e}")
+            return False
+    
     def run_wizard(self) -> Tuple[bool, Dict[str, Any]]:
         """
         Runs the setup wizard and returns completion status and final state.
@@ -260,10 +722,11 @@ class OgresyncSetupWizard:
                 return False, self.wizard_state
                 
             self._initialize_ui()
+            self._prefetch_tool_paths()
             
             # Start the wizard
             if self.dialog:
-                self.dialog.after(1000, self._execute_current_step)
+                self.dialog.after(_AUTO_ADVANCE_DELAY_MS, self._execute_current_step)
                 self.dialog.mainloop()
             
             return self.wizard_state["setup_complete"], self.wizard_state
@@ -279,8 +742,21 @@ class OgresyncSetupWizard:
         else:
             self.dialog = tk.Tk()
         
+        # Theme colors, resolved once for all wizard widgets
+        if ui_elements:
+            self._bg_primary = ui_elements.Colors.BG_PRIMARY
+            self._text_primary = ui_elements.Colors.TEXT_PRIMARY
+            self._text_secondary = ui_elements.Colors.TEXT_SECONDARY
+        else:
+            self._bg_primary, self._text_primary, self._text_secondary = "#FAFBFC", "#1E293B", "#475569"
+        
+        # Fonts shared by all step widgets
+        self._font_step_icon = tkfont.Font(root=self.dialog, family="Arial", size=14)
+        self._font_step_title = tkfont.Font(root=self.dialog, family="Arial", size=11, weight="bold")
+        self._font_step_text = tkfont.Font(root=self.dialog, family="Arial", size=9, weight="normal")
+        
         self.dialog.title("Ogresync Setup Wizard")
-        self.dialog.configure(bg=ui_elements.Colors.BG_PRIMARY if ui_elements else "#FAFBFC")
+        self.dialog.configure(bg=self._bg_primary)
         self.dialog.resizable(True, True)  # Allow resizing to accommodate content
         self.dialog.grab_set()
         
@@ -290,8 +766,9 @@ class OgresyncSetupWizard:
         # Center and size the dialog - increased size to accommodate all content
         width, height = 900, 700  # Increased from 900x700 to accommodate all UI elements
         self.dialog.minsize(900, 700)  # Set minimum size constraints
-        x = (self.dialog.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.dialog.winfo_screenheight() // 2) - (height // 2)
+        screen_width, screen_height = self._get_screen_size(self.dialog)
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
         self.dialog.geometry(f"{width}x{height}+{x}+{y}")
         
         # Initialize fonts and styles if ui_elements is available
@@ -301,11 +778,48 @@ class OgresyncSetupWizard:
                 ui_elements.setup_premium_styles()
             except Exception:
                 pass
+        
+        # Wizard label styles (configured after the premium styles, which may switch the theme)
+        self._setup_wizard_styles()
+    
+    def _get_screen_size(self, window):
+        """Returns (width, height) of the screen, querying Tk only the first time."""
+        if self._screen_size is None:
+            self._screen_size = (window.winfo_screenwidth(), window.winfo_screenheight())
+        return self._screen_size
+    
+    def _setup_wizard_styles(self):
+        """Configures the named ttk styles used by the wizard's static labels."""
+        style = ttk.Style(self.dialog)
+        style.configure(
+            "Wizard.Title.TLabel",
+            font=("Arial", 18, "bold"),
+            background=self._bg_primary,
+            foreground=self._text_primary
+        )
+        style.configure(
+            "Wizard.Subtitle.TLabel",
+            font=("Arial", 12, "normal"),
+            background=self._bg_primary,
+            foreground=self._text_secondary
+        )
+        style.configure(
+            "Wizard.StepTitle.TLabel",
+            font=self._font_step_title,
+            background="#FFFFFF",
+            foreground="#1E293B"
+        )
+        style.configure(
+            "Wizard.StepDesc.TLabel",
+            font=self._font_step_text,
+            background="#FFFFFF",
+            foreground="#475569"
+        )
     
     def _initialize_ui(self):
         """Initializes the wizard user interface."""
         # Main container
-        main_frame = tk.Frame(self.dialog, bg=ui_elements.Colors.BG_PRIMARY if ui_elements else "#FAFBFC")
+        main_frame = tk.Frame(self.dialog, bg=self._bg_primary)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Header
@@ -322,24 +836,20 @@ class OgresyncSetupWizard:
     
     def _create_header(self, parent):
         """Creates the wizard header."""
-        header_frame = tk.Frame(parent, bg=ui_elements.Colors.BG_PRIMARY if ui_elements else "#FAFBFC")
+        header_frame = tk.Frame(parent, bg=self._bg_primary)
         header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        title_label = tk.Label(
+        title_label = ttk.Label(
             header_frame,
             text="🚀 Ogresync Setup Wizard",
-            font=("Arial", 18, "bold"),
-            bg=ui_elements.Colors.BG_PRIMARY if ui_elements else "#FAFBFC",
-            fg=ui_elements.Colors.TEXT_PRIMARY if ui_elements else "#1E293B"
+            style="Wizard.Title.TLabel"
         )
         title_label.pack()
         
-        subtitle_label = tk.Label(
+        subtitle_label = ttk.Label(
             header_frame,
             text="Setting up your Obsidian vault synchronization with GitHub",
-            font=("Arial", 12, "normal"),
-            bg=ui_elements.Colors.BG_PRIMARY if ui_elements else "#FAFBFC",
-            fg=ui_elements.Colors.TEXT_SECONDARY if ui_elements else "#475569"
+            style="Wizard.Subtitle.TLabel"
         )
         subtitle_label.pack(pady=(8, 0))
     
@@ -365,22 +875,26 @@ class OgresyncSetupWizard:
         right_column = tk.Frame(steps_frame, bg="#FFFFFF")
         right_column.pack(side="right", fill="both", expand=True, padx=(10, 0))
         
+        # Steps are gridded in one stretching column inside each column frame
+        left_column.grid_columnconfigure(0, weight=1)
+        right_column.grid_columnconfigure(0, weight=1)
+        
         # Create step widgets in two columns
-        total_steps = len(self.setup_steps)
         mid_point = 6  # First 6 steps in left column
         
         for i, step in enumerate(self.setup_steps):
-            parent_frame = left_column if i < mid_point else right_column
-            widget = self._create_step_widget(step, i, parent_frame)
-            self.step_widgets.append(widget)
+            if i < mid_point:
+                self._create_step_widget(step, i, left_column, i)
+            else:
+                self._create_step_widget(step, i, right_column, i - mid_point)
         
-        # Add control area to right column
-        self._create_button_spacer(right_column)
+        # Add control area to right column, below its steps
+        self._create_button_spacer(right_column, len(self.setup_steps) - mid_point)
     
-    def _create_step_widget(self, step, index, parent_frame):
-        """Creates a widget for displaying a single step."""
+    def _create_step_widget(self, step, index, parent_frame, row):
+        """Creates the widgets for displaying a single step and records them in _step_widgets."""
         step_container = tk.Frame(parent_frame, bg="#FFFFFF")
-        step_container.pack(fill=tk.X, pady=4, padx=10)
+        step_container.grid(row=row, column=0, sticky="ew", pady=4, padx=10)
         
         # Step frame with border
         step_frame = tk.Frame(
@@ -395,7 +909,7 @@ class OgresyncSetupWizard:
         icon_label = tk.Label(
             step_frame,
             text=step.get_status_icon(),
-            font=("Arial", 14),
+            font=self._font_step_icon,
             bg="#FFFFFF",
             fg="#1E293B",
             width=3
@@ -406,22 +920,18 @@ class OgresyncSetupWizard:
         info_frame = tk.Frame(step_frame, bg="#FFFFFF")
         info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        title_label = tk.Label(
+        title_label = ttk.Label(
             info_frame,
             text=f"{index + 1}. {step.title}",
-            font=("Arial", 11, "bold"),
-            bg="#FFFFFF",
-            fg="#1E293B",
+            style="Wizard.StepTitle.TLabel",
             anchor="w"
         )
         title_label.pack(fill=tk.X)
         
-        desc_label = tk.Label(
+        desc_label = ttk.Label(
             info_frame,
             text=step.description,
-            font=("Arial", 9, "normal"),
-            bg="#FFFFFF",
-            fg="#475569",
+            style="Wizard.StepDesc.TLabel",
             anchor="w",
             wraplength=280
         )
@@ -431,7 +941,7 @@ class OgresyncSetupWizard:
         error_label = tk.Label(
             info_frame,
             text="",
-            font=("Arial", 9, "normal"),
+            font=self._font_step_text,
             bg="#FFFFFF",
             fg="#EF4444",
             anchor="w",
@@ -440,16 +950,11 @@ class OgresyncSetupWizard:
         error_label.pack(fill=tk.X)
         error_label.pack_forget()  # Hide initially
         
-        return {
-            "container": step_container,
-            "frame": step_frame,
-            "icon": icon_label,
-            "title": title_label,
-            "description": desc_label,
-            "error": error_label
-        }
+        self._step_widgets.append(_StepWidgets(
+            step_container, step_frame, icon_label, title_label, desc_label, error_label
+        ))
     
-    def _create_button_spacer(self, parent):
+    def _create_button_spacer(self, parent, row):
         """Creates the button control area."""
         button_spacer_frame = tk.Frame(
             parent, 
@@ -457,7 +962,7 @@ class OgresyncSetupWizard:
             relief=tk.SOLID,
             borderwidth=1
         )
-        button_spacer_frame.pack(fill=tk.X, pady=20, padx=10)
+        button_spacer_frame.grid(row=row, column=0, sticky="ew", pady=20, padx=10)
         
         # Header for button area
         button_header = tk.Label(
@@ -483,10 +988,34 @@ class OgresyncSetupWizard:
         )
         self.status_label.pack(anchor=tk.W, padx=12, pady=(8, 4))
         
-        # Button container
-        self.button_container = tk.Frame(button_spacer_frame, bg="#FFFFFF", height=80)
+        # Button container; a zero-width strut keeps it 80px tall before the buttons are shown
+        self.button_container = tk.Frame(button_spacer_frame, bg="#FFFFFF")
         self.button_container.pack(fill=tk.X, padx=12, pady=(0, 12))
-        self.button_container.pack_propagate(False)
+        tk.Frame(self.button_container, bg="#FFFFFF", height=80, width=0).pack(side=tk.LEFT)
+        
+        # Step action and cancel buttons, reconfigured by _show_step_buttons()
+        self._action_button = tk.Button(
+            self.button_container,
+            font=("Arial", 10, "bold"),
+            fg="#FFFFFF",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=16,
+            pady=8
+        )
+        self._cancel_button = tk.Button(
+            self.button_container,
+            text="Cancel Setup",
+            command=self._cancel_setup,
+            font=("Arial", 10, "normal"),
+            bg="#EF4444",
+            fg="#FFFFFF",
+            relief=tk.FLAT,
+            cursor="hand2",
+            padx=16,
+            pady=8
+        )
+        self._step_buttons_packed = False
     
     def _create_control_area(self, parent):
         """Creates the control area - this is now handled in _create_button_spacer."""
@@ -499,10 +1028,8 @@ class OgresyncSetupWizard:
     
     def _show_step_buttons(self):
         """Shows appropriate buttons for the current step."""
-        # Clear existing buttons
-        if self.button_container:
-            for widget in self.button_container.winfo_children():
-                widget.destroy()
+        if not self.button_container:
+            return
         
         current_step = self.wizard_state["current_step"]
         
@@ -510,50 +1037,25 @@ class OgresyncSetupWizard:
             step = self.setup_steps[current_step]
             
             # Execute button
-            exec_btn = tk.Button(
-                self.button_container,
+            self._action_button.config(
                 text=f"▶ Execute: {step.title}",
                 command=self._execute_current_step,
-                font=("Arial", 10, "bold"),
-                bg="#6366F1",
-                fg="#FFFFFF",
-                relief=tk.FLAT,
-                cursor="hand2",
-                padx=16,
-                pady=8
+                bg="#6366F1"
             )
-            exec_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 8))
             
         else:
             # Setup is complete - show Complete Setup button
-            complete_btn = tk.Button(
-                self.button_container,
+            self._action_button.config(
                 text="🎉 Complete Setup",
                 command=self._complete_setup,
-                font=("Arial", 10, "bold"),
-                bg="#10B981",
-                fg="#FFFFFF",
-                relief=tk.FLAT,
-                cursor="hand2",
-                padx=16,
-                pady=8
+                bg="#10B981"
             )
-            complete_btn.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 8))
         
-        # Cancel button
-        cancel_btn = tk.Button(
-            self.button_container,
-            text="Cancel Setup",
-            command=self._cancel_setup,
-            font=("Arial", 10, "normal"),
-            bg="#EF4444",
-            fg="#FFFFFF",
-            relief=tk.FLAT,
-            cursor="hand2",
-            padx=16,
-            pady=8
-        )
-        cancel_btn.pack(side=tk.RIGHT)
+        # The buttons are created once and only packed the first time they are shown
+        if not self._step_buttons_packed:
+            self._action_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 8))
+            self._cancel_button.pack(side=tk.RIGHT)
+            self._step_buttons_packed = True
     
     def _update_status(self, message):
         """Update the status label with a message."""
@@ -563,26 +1065,20 @@ class OgresyncSetupWizard:
             self.dialog.update_idletasks()
     
     def _update_step_display(self):
-        """Update the visual display of all steps."""
-        for i, (step, widget) in enumerate(zip(self.setup_steps, self.step_widgets)):
-            if widget and isinstance(widget, dict):
-                # Update the step icon based on status
-                icon_label = widget.get("icon")
-                if icon_label:
-                    icon_label.config(text=step.get_status_icon())
-                    
-                    # Update colors based on status
-                    if step.status == "running":
-                        icon_label.config(fg="#F59E0B")  # Orange for running
-                    elif step.status == "success":
-                        icon_label.config(fg="#10B981")  # Green for success
-                    elif step.status == "error":
-                        icon_label.config(fg="#EF4444")  # Red for error
-                    else:
-                        icon_label.config(fg="#6B7280")  # Gray for pending
-        
-        if self.dialog:
-            self.dialog.update_idletasks()
+        """
+        Update the visual display of all steps.
+        The change is drawn when Tk next goes idle; callers about to block call
+        update_idletasks() themselves (or _update_status(), which does).
+        """
+        icons, colors = _STEP_STATUS_ICONS, _STEP_STATUS_COLORS
+        rendered = self._last_rendered_status
+        for i, (step, widgets) in enumerate(zip(self.setup_steps, self._step_widgets)):
+            # Update the step icon and its color based on status, skipping unchanged steps
+            status = step.status
+            if rendered[i] == status:
+                continue
+            widgets.icon.config(text=icons[status], fg=colors[status])
+            rendered[i] = status
     
     def _execute_current_step(self):
         """Executes the current step."""
@@ -594,31 +1090,21 @@ class OgresyncSetupWizard:
             return
         
         step = self.setup_steps[current_index]
-        step.set_status("running")
+        step.set_status(StepStatus.RUNNING)
         self._update_step_display()
-        
-        # Map step functions
-        step_functions = {
-            0: self._step_obsidian_checkup,
-            1: self._step_git_check,
-            2: self._step_choose_vault,
-            3: self._step_initialize_git,
-            4: self._step_ssh_key_setup,
-            5: self._step_known_hosts,
-            6: self._step_test_ssh,
-            7: self._step_github_repository,
-            8: self._step_repository_sync,
-            9: self._step_final_sync,
-            10: self._step_complete_setup
-        }
+        if self.dialog:
+            self.dialog.update_idletasks()  # show the running step before the step function blocks
         
         try:
-            step_function = step_functions.get(current_index)
+            step_function = self._step_functions[current_index] if current_index < len(self._step_functions) else None
             if step_function:
+                started = time.monotonic()
                 success, error_message = step_function()
+                elapsed = time.monotonic() - started
                 if success:
-                    step.set_status("success")
-                    self._set_status_message(f"✅ {step.title} completed successfully", "#10B981")
+                    step.set_status(StepStatus.SUCCESS)
+                    message_format, color = _STEP_RESULT_MESSAGES[StepStatus.SUCCESS]
+                    self._set_status_message(message_format % step.title, color)
                     self.wizard_state["current_step"] += 1
                     self._update_step_display()
                     self._show_step_buttons()
@@ -627,19 +1113,22 @@ class OgresyncSetupWizard:
                     if self.wizard_state["current_step"] >= len(self.setup_steps):
                         self._set_status_message("🎉 All steps completed! Ready to finish setup.", "#10B981")
                     else:
-                        # Auto-advance to next step if not the last one
+                        # Auto-advance to next step if not the last one, pausing only
+                        # when the step finished too quickly for its result to be seen
                         if self.dialog:
-                            self.dialog.after(1500, self._execute_current_step)
+                            delay = _AUTO_ADVANCE_DELAY_MS if elapsed < _MIN_VISIBLE_STEP_SECONDS else 0
+                            self.dialog.after(delay, self._execute_current_step)
                 else:
-                    step.set_status("error", error_message)
-                    self._set_status_message(f"❌ {step.title} failed: {error_message}", "#EF4444")
+                    step.set_status(StepStatus.ERROR, error_message)
+                    message_format, color = _STEP_RESULT_MESSAGES[StepStatus.ERROR]
+                    self._set_status_message(message_format % (step.title, error_message), color)
                     self._update_step_display()
             else:
-                step.set_status("error", "Step function not implemented")
+                step.set_status(StepStatus.ERROR, "Step function not implemented")
                 self._set_status_message(f"❌ Step function not implemented", "#EF4444")
                 self._update_step_display()
         except Exception as e:
-            step.set_status("error", str(e))
+            step.set_status(StepStatus.ERROR, str(e))
             self._set_status_message(f"❌ Error: {str(e)}", "#EF4444")
             self._update_step_display()
     
@@ -647,7 +1136,7 @@ class OgresyncSetupWizard:
         """Skips the current step (for manual steps)."""
         current_index = self.wizard_state["current_step"]
         step = self.setup_steps[current_index]
-        step.set_status("success")
+        step.set_status(StepStatus.SUCCESS)
         self._set_status_message(f"⏭ {step.title} skipped (manual completion)", "#F59E0B")
         self.wizard_state["current_step"] += 1
         self._update_step_display()
@@ -656,7 +1145,7 @@ class OgresyncSetupWizard:
         # Auto-advance to next step
         if self.wizard_state["current_step"] < len(self.setup_steps):
             if self.dialog:
-                self.dialog.after(1500, self._execute_current_step)
+                self.dialog.after(_AUTO_ADVANCE_DELAY_MS, self._execute_current_step)
         else:
             self._set_status_message("🎉 Setup completed!", "#10B981")
     
@@ -701,8 +1190,9 @@ class OgresyncSetupWizard:
         # Center and size the dialog appropriately - significantly increased size for better text display
         completion_dialog.update_idletasks()
         width, height = 850, 750  # Increased from 750x650 to provide much more space
-        x = (completion_dialog.winfo_screenwidth() // 2) - (width // 2)
-        y = (completion_dialog.winfo_screenheight() // 2) - (height // 2)
+        screen_width, screen_height = self._get_screen_size(completion_dialog)
+        x = (screen_width // 2) - (width // 2)
+        y = (screen_height // 2) - (height // 2)
         completion_dialog.geometry(f"{width}x{height}+{x}+{y}")
         completion_dialog.minsize(800, 700)  # Increased minimum size
         
@@ -739,18 +1229,9 @@ class OgresyncSetupWizard:
         message_inner = tk.Frame(message_frame, bg="#FFFFFF")
         message_inner.pack(fill=tk.X, padx=25, pady=25)  # Increased padding
         
-        completion_text = (
-            "Congratulations! Your Ogresync setup is now complete.\n\n"
-            "✅ Obsidian vault is configured\n"
-            "✅ Git repository is initialized\n"
-            "✅ GitHub integration is active\n"
-            "✅ SSH keys are configured\n\n"
-            "Your notes are now synchronized with GitHub and ready for seamless editing!"
-        )
-        
         message_label = tk.Label(
             message_inner,
-            text=completion_text,
+            text=_COMPLETION_TEXT,
             font=("Arial", 12),  # Slightly larger font for better readability
             bg="#FFFFFF",
             fg="#475569",
@@ -775,16 +1256,9 @@ class OgresyncSetupWizard:
         )
         next_steps_title.pack(anchor=tk.W)
         
-        next_steps_text = (
-            "• Ogresync will now switch to sync mode\n"
-            "• Use the sync interface to keep your notes updated\n" 
-            "• Your changes will automatically sync with GitHub\n"
-            "• Collaborate with others by sharing your repository"
-        )
-        
         next_steps_label = tk.Label(
             next_steps_inner,
-            text=next_steps_text,
+            text=_NEXT_STEPS_TEXT,
             font=("Arial", 12),  # Slightly larger font
             bg="#F0FDF4",
             fg="#166534",
@@ -839,14 +1313,9 @@ class OgresyncSetupWizard:
         if not config_data:
             return
             
-        summary_text = f"""Configuration Summary:
-
-📁 Vault Path: {config_data.get('VAULT_PATH', 'Not set')}
-🔧 Obsidian Path: {config_data.get('OBSIDIAN_PATH', 'Not set')}
-🌐 GitHub Repository: {config_data.get('GITHUB_REMOTE_URL', 'Not set')}
-✅ Setup Status: {'Complete' if config_data.get('SETUP_DONE') == '1' else 'Incomplete'}
-
-Your configuration has been saved and Ogresync is ready to use!"""
+        summary_values = _ConfigSummaryValues(config_data)
+        summary_values['SETUP_STATUS'] = 'Complete' if config_data.get('SETUP_DONE') == '1' else 'Incomplete'
+        summary_text = _CONFIG_SUMMARY_TEMPLATE.format_map(summary_values)
         
         if ui_elements:
             ui_elements.show_premium_info("Configuration Summary", summary_text, parent)
@@ -857,14 +1326,104 @@ Your configuration has been saved and Ogresync is ready to use!"""
     # STEP IMPLEMENTATION FUNCTIONS
     # =============================================================================
     
+    def _resolve_tool(self, name):
+        """
+        Return the absolute path of an executable on PATH, or None if it is not there.
+        The lookup is done once per wizard run; installing software and retrying
+        (see _offer_retry_after_installation) starts it over.
+        """
+        tool_paths = self.wizard_state["tool_paths"]
+        try:
+            return tool_paths[name]
+        except KeyError:
+            future = self._tool_path_futures.pop(name, None)
+            path = tool_paths[name] = future.result() if future else shutil.which(name)
+            return path
+    
+    def _probe_cache_file(self):
+        """Path of _WIZARD_CACHE_FILE, or None if the config directory is unknown."""
+        config_dir, error = self._safe_ogresync_call('get_config_directory')
+        if error or not config_dir:
+            return None
+        return os.path.join(config_dir, _WIZARD_CACHE_FILE)
+    
+    def _cached_probe(self, name):
+        """
+        Return the path an earlier wizard run found for name ('obsidian_path' or
+        'git_path'), or None if there is none or it no longer exists.
+        """
+        if self._probe_cache is None:
+            self._probe_cache = {}
+            cache_file = self._probe_cache_file()
+            if cache_file:
+                try:
+                    with open(cache_file, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        self._probe_cache = data
+                except (OSError, ValueError):
+                    pass
+        path = self._probe_cache.get(name)
+        if isinstance(path, str) and path and os.path.exists(path):
+            return path
+        return None
+    
+    def _remember_probe(self, name, path):
+        """Record a detected path in _WIZARD_CACHE_FILE for later wizard runs."""
+        if self._probe_cache is None:
+            self._cached_probe(name)  # load what is already stored
+        if self._probe_cache.get(name) == path:
+            return
+        self._probe_cache[name] = path
+        cache_file = self._probe_cache_file()
+        if not cache_file:
+            return
+        try:
+            tmp_file = cache_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._probe_cache, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"[DEBUG] Could not save wizard cache: {e}")
+    
+    def _prefetch_tool_paths(self):
+        """
+        Start the PATH lookups for the executables the steps need, so they run while
+        the first steps are shown instead of when each step gets to them.
+        Only plain lookups go here; detection that may prompt the user stays on the Tk thread.
+        """
+        executor = ThreadPoolExecutor(max_workers=len(_PREFETCHED_TOOLS))
+        self._tool_path_futures = {
+            name: executor.submit(shutil.which, name) for name in _PREFETCHED_TOOLS
+        }
+        # Don't wait here; _resolve_tool() collects each result when a step needs it
+        executor.shutdown(wait=False)
+    
+    def _git_repo_state(self, vault_path):
+        """
+        Return what this wizard run knows about the Git repository at vault_path, so
+        later steps can skip re-running git for it. Keys are filled in as learned:
+        'is_repo' (bool), 'remote_url' (origin URL, None if no origin is set) and
+        'branch' (the checked-out branch, see _get_current_branch()).
+        Steps that init the repository or change origin update it.
+        """
+        return self.wizard_state["git_repo_state"].setdefault(vault_path, {})
+    
     def _step_obsidian_checkup(self):
         """Step 1: Verify Obsidian installation."""
         try:
-            obsidian_path, error = self._safe_wizard_steps_call('find_obsidian_path')
-            if error:
-                return False, f"Obsidian detection not available: {error}"
+            # An installation found by an earlier run needs no new search (which may
+            # ask the user to locate Obsidian by hand)
+            obsidian_path = self._cached_probe('obsidian_path')
+            if not obsidian_path:
+                obsidian_path, error = self._safe_wizard_steps_call('find_obsidian_path')
+                if error:
+                    return False, f"Obsidian detection not available: {error}"
             
             if obsidian_path:
+                if os.path.exists(obsidian_path):
+                    # Launch commands (e.g. flatpak) cannot be checked later, so only paths are kept
+                    self._remember_probe('obsidian_path', obsidian_path)
                 self.wizard_state["obsidian_path"] = obsidian_path
                 config_data = self._safe_ogresync_get('config_data')
                 if config_data:
@@ -887,6 +1446,11 @@ Your configuration has been saved and Ogresync is ready to use!"""
     def _step_git_check(self):
         """Step 2: Verify Git installation."""
         try:
+            # Git on PATH, or where an earlier run found it, needs no further checks
+            git_path = self._resolve_tool('git') or self._cached_probe('git_path')
+            if git_path:
+                return True, f"Git is installed at: {git_path}"
+            
             # First try basic detection
             is_installed, error = self._safe_wizard_steps_call('is_git_installed')
             if error:
@@ -894,9 +1458,8 @@ Your configuration has been saved and Ogresync is ready to use!"""
                 git_path, path_error = self._safe_wizard_steps_call('detect_git_path')
                 if path_error:
                     # Fallback check using subprocess
-                    import subprocess
                     try:
-                        result = subprocess.run(['git', '--version'], capture_output=True, text=True)
+                        result = subprocess.run(['git', '--version'], capture_output=True, text=True, **_POPEN_KW)
                         if result.returncode == 0:
                             return True, "Git is installed and available"
                         else:
@@ -920,6 +1483,8 @@ Your configuration has been saved and Ogresync is ready to use!"""
                         else:
                             return False, "Git is not installed. Please install Git and restart the wizard."
                 elif git_path:
+                    if os.path.isabs(git_path) and os.path.exists(git_path):
+                        self._remember_probe('git_path', git_path)
                     return True, f"Git is installed at: {git_path}"
                 else:
                     # User declined to install - return error
@@ -941,6 +1506,8 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     else:
                         return False, "Git is not installed. Please install Git and restart the wizard."
                 elif git_path:
+                    if os.path.isabs(git_path) and os.path.exists(git_path):
+                        self._remember_probe('git_path', git_path)
                     return True, f"Git is installed at: {git_path}"
                 else:
                     # User declined to install - return error
@@ -977,8 +1544,6 @@ Your configuration has been saved and Ogresync is ready to use!"""
     def _step_initialize_git(self):
         """Step 4: Initialize Git repository in vault, commit existing files or create README."""
         try:
-            import subprocess  # Import at method level to ensure availability
-            
             vault_path = self.wizard_state.get("vault_path")
             if not vault_path:
                 return False, "Vault path not set."
@@ -986,70 +1551,69 @@ Your configuration has been saved and Ogresync is ready to use!"""
             self._update_status("Checking Git repository status...")
             
             # Step 4.1: Check if git is already initialized
+            repo_state = self._git_repo_state(vault_path)
             is_git_repo = self._safe_github_setup_call('is_git_repo', vault_path)
-            if not is_git_repo[0]:  # Not a git repo
+            if is_git_repo[0]:
+                repo_state["is_repo"] = True
+            else:  # Not a git repo
                 self._update_status("Initializing Git repository...")
                 result, error = self._safe_github_setup_call('initialize_git_repo', vault_path)
-                if error:
+                if error or result is False:
                     # Fallback manual git init
                     try:
-                        subprocess.run(['git', 'init'], cwd=vault_path, check=True)
-                        subprocess.run(['git', 'branch', '-M', 'main'], cwd=vault_path, check=True)
+                        init_result = _git_init_main(vault_path)
                     except Exception as fallback_error:
                         return False, f"Git initialization failed: {fallback_error}"
+                    if init_result.returncode != 0:
+                        return False, f"Git initialization failed: {init_result.stderr}"
+                    repo_state["is_repo"] = True
+                elif result:
+                    repo_state["is_repo"] = True
             
             # Step 4.2: Check for existing files (excluding .git and common non-content files)
-            existing_files = []
+            existing_file_count = 0
             has_existing_git_history = False
             
             if os.path.exists(vault_path):
                 # Check if there's existing git history
                 try:
-                    result = subprocess.run(['git', 'log', '--oneline'], 
-                                          cwd=vault_path, capture_output=True, text=True)
-                    if result.returncode == 0 and result.stdout.strip():
+                    # rev-list --count fails when HEAD has no commits and prints one number
+                    # otherwise, however long the history is
+                    result = subprocess.run(['git', 'rev-list', '--count', 'HEAD'], 
+                                          cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
+                    if result.returncode == 0 and result.stdout.strip() not in ('', '0'):
                         has_existing_git_history = True
-                        commit_count = len(result.stdout.strip().split('\n'))
+                        commit_count = result.stdout.strip()
                         self._update_status(f"Found existing git history with {commit_count} commit(s)")
                 except Exception:
                     pass
                 
-                # Check for content files
-                for root_dir, dirs, files in os.walk(vault_path):
-                    # Skip .git directory completely - never include it in file analysis
-                    if '.git' in root_dir:
-                        continue
-                    for file in files:
-                        # Skip hidden files and common non-content files, but include README.md in count
-                        if not file.startswith('.') and file != '.gitignore':
-                            rel_path = os.path.relpath(os.path.join(root_dir, file), vault_path)
-                            existing_files.append(rel_path)
+                # Count content files: hidden files are skipped, README.md is included
+                existing_file_count = _count_content_files(vault_path)
             
-            has_existing_files = len(existing_files) > 0
-            self._update_status(f"Vault analysis: {len(existing_files)} content files found")
+            has_existing_files = existing_file_count > 0
+            self._update_status(f"Vault analysis: {existing_file_count} content files found")
             
             # Always ensure git user config is set first
             self._safe_github_setup_call('ensure_git_user_config')
             
             if has_existing_files or has_existing_git_history:
                 # Step 4.3: Commit existing files (if any changes to commit)
-                self._update_status(f"Processing existing repository with {len(existing_files)} files...")
+                self._update_status(f"Processing existing repository with {existing_file_count} files...")
                 
                 # Stage and commit existing files
-                import subprocess
                 try:
-                    subprocess.run(['git', 'add', '-A'], cwd=vault_path, check=True)
-                    result = subprocess.run(['git', 'commit', '-m', 'Initial commit with existing vault files'], 
-                                          cwd=vault_path, capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return True, f"Git initialized and {len(existing_files)} existing files committed"
+                    subprocess.run(['git', 'add', '-A'], cwd=vault_path, check=True, **_POPEN_KW)
+                    committed, commit_error = _git_commit_staged(vault_path, 'Initial commit with existing vault files')
+                    if committed:
+                        return True, f"Git initialized and {existing_file_count} existing files committed"
                     else:
                         # Check if it's because there's nothing to commit (already committed)
-                        if "nothing to commit" in result.stdout.lower() or has_existing_git_history:
+                        if commit_error is None or has_existing_git_history:
                             # Repository already has commits and working directory is clean
-                            return True, f"Git repository already initialized with {len(existing_files)} files and existing commits"
+                            return True, f"Git repository already initialized with {existing_file_count} files and existing commits"
                         else:
-                            return False, f"Failed to commit existing files: {result.stderr}"
+                            return False, f"Failed to commit existing files: {commit_error}"
                 except Exception as e:
                     return False, f"Error committing existing files: {str(e)}"
             
@@ -1063,15 +1627,14 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     # README already exists, just commit it if needed
                     self._update_status("README.md already exists, ensuring it's committed...")
                     try:
-                        subprocess.run(['git', 'add', 'README.md'], cwd=vault_path, check=True)
-                        result = subprocess.run(['git', 'commit', '-m', 'Add existing README'], 
-                                              cwd=vault_path, capture_output=True, text=True)
-                        if result.returncode == 0:
+                        subprocess.run(['git', 'add', 'README.md'], cwd=vault_path, check=True, **_POPEN_KW)
+                        committed, commit_error = _git_commit_staged(vault_path, 'Add existing README')
+                        if committed:
                             return True, "Git initialized with existing README file"
-                        elif "nothing to commit" in result.stdout.lower():
+                        elif commit_error is None:
                             return True, "Git repository already properly initialized"
                         else:
-                            return False, f"Failed to commit existing README: {result.stderr}"
+                            return False, f"Failed to commit existing README: {commit_error}"
                     except Exception as e:
                         return False, f"Error handling existing README: {str(e)}"
                 
@@ -1084,15 +1647,13 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     return False, f"Failed to create README file: {str(e)}"
                 
                 # Commit the README file
-                import subprocess
                 try:
-                    subprocess.run(['git', 'add', '-A'], cwd=vault_path, check=True)
-                    result = subprocess.run(['git', 'commit', '-m', 'Initial commit with README'], 
-                                          cwd=vault_path, capture_output=True, text=True)
-                    if result.returncode == 0:
+                    subprocess.run(['git', 'add', '-A'], cwd=vault_path, check=True, **_POPEN_KW)
+                    committed, commit_error = _git_commit_staged(vault_path, 'Initial commit with README')
+                    if committed:
                         return True, "Git initialized with README file and committed"
                     else:
-                        return False, f"Failed to commit README file: {result.stderr}"
+                        return False, f"Failed to commit README file: {commit_error or 'nothing to commit'}"
                 except Exception as e:
                     return False, f"Error committing README file: {str(e)}"
                         
@@ -1103,11 +1664,12 @@ Your configuration has been saved and Ogresync is ready to use!"""
         """Step 5: Generate or verify SSH key."""
         try:
             # Check if SSH key exists
-            ssh_key_path = os.path.expanduser(os.path.join("~", ".ssh", "id_rsa.pub"))
+            ssh_key_path = _SSH_PUBKEY_PATH
             if os.path.exists(ssh_key_path):
                 return True, "SSH key already exists"
             else:
-                # Generate SSH key
+                # Generate SSH key (any key read earlier is about to be replaced)
+                self._cached_ssh_pubkey = None
                 email = None
                 if ui_elements and hasattr(ui_elements, 'ask_premium_string'):
                     email = ui_elements.ask_premium_string(
@@ -1129,18 +1691,15 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     
                     # Use synchronous SSH key generation for better reliability
                     try:
-                        # Create .ssh directory if it doesn't exist
-                        ssh_dir = os.path.expanduser("~/.ssh")
-                        os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
+                        self._ensure_ssh_dir()
                         
                         # Generate SSH key synchronously
-                        ssh_key_base = os.path.expanduser("~/.ssh/id_rsa")
                         result = subprocess.run([
-                            'ssh-keygen', '-t', 'rsa', '-b', '4096', 
+                            self._resolve_tool('ssh-keygen') or 'ssh-keygen', '-t', 'rsa', '-b', '4096', 
                             '-C', email.strip(), 
-                            '-f', ssh_key_base,
+                            '-f', _SSH_PRIVKEY_BASE,
                             '-N', ''  # No passphrase
-                        ], capture_output=True, text=True, timeout=30)
+                        ], capture_output=True, text=True, timeout=30, **_POPEN_KW)
                         
                         if result.returncode == 0:
                             # Verify the key was created
@@ -1155,12 +1714,27 @@ Your configuration has been saved and Ogresync is ready to use!"""
                             if async_error:
                                 return False, f"SSH key generation failed: {async_error}"
                             
-                            # Wait longer and check multiple times
-                            for i in range(10):  # Wait up to 10 seconds
-                                time.sleep(1)
-                                if os.path.exists(ssh_key_path):
-                                    return True, "SSH key generated successfully"
-                                self._update_status(f"Generating SSH key... ({i+1}/10)")
+                            # Poll for the key for up to 10 seconds, starting with short waits
+                            # since the key is usually written within a fraction of a second.
+                            # ssh-keygen writes the public key last, so the pair is complete once
+                            # the .pub file has content and the private key is there as well
+                            started = time.monotonic()
+                            delay = 0.02
+                            shown_seconds = 0
+                            while True:
+                                try:
+                                    if os.path.getsize(_SSH_PUBKEY_PATH) > 0 and os.path.exists(_SSH_PRIVKEY_BASE):
+                                        return True, "SSH key generated successfully"
+                                except OSError:
+                                    pass
+                                elapsed = time.monotonic() - started
+                                if elapsed >= 10:
+                                    break
+                                if int(elapsed) > shown_seconds:
+                                    shown_seconds = int(elapsed)
+                                    self._update_status(f"Generating SSH key... ({shown_seconds}/10)")
+                                time.sleep(min(delay, 10 - elapsed))
+                                delay = min(delay * 1.5, 0.5)
                             
                             return False, "SSH key generation failed. Please try again."
                             
@@ -1181,16 +1755,23 @@ Your configuration has been saved and Ogresync is ready to use!"""
             result, error = self._safe_wizard_steps_call('ensure_github_known_host')
             if error:
                 # Fallback manual known_hosts setup
-                import subprocess
                 try:
-                    # Create .ssh directory if it doesn't exist
-                    ssh_dir = os.path.expanduser("~/.ssh")
-                    os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
+                    # Nothing to fetch if GitHub is already listed in plain form
+                    # (hashed -H entries cannot be matched by name)
+                    try:
+                        with open(_SSH_KNOWN_HOSTS_PATH, "rb") as f:
+                            if b"github.com" in f.read():
+                                return True, "GitHub already in known hosts"
+                    except FileNotFoundError:
+                        pass
                     
-                    # Add GitHub to known_hosts
-                    subprocess.run(['ssh-keyscan', '-H', 'github.com'], 
-                                 stdout=open(os.path.expanduser("~/.ssh/known_hosts"), "a"),
-                                 check=True)
+                    self._ensure_ssh_dir()
+                    
+                    # Add GitHub to known_hosts; ssh-keyscan writes straight into the file
+                    with open(_SSH_KNOWN_HOSTS_PATH, "ab") as known_hosts:
+                        subprocess.run([self._resolve_tool('ssh-keyscan') or 'ssh-keyscan', '-H', 'github.com'], 
+                                     stdout=known_hosts,
+                                     check=True, timeout=10, **_POPEN_KW)
                     return True, "GitHub added to known hosts (fallback method)"
                 except Exception as fallback_error:
                     return False, f"Failed to add GitHub to known hosts: {fallback_error}"
@@ -1220,7 +1801,6 @@ Your configuration has been saved and Ogresync is ready to use!"""
                         self.dialog
                     )
                 else:
-                    import tkinter.messagebox as messagebox
                     user_choice = messagebox.askyesno(
                         "SSH Setup",
                         "SSH connection failed. Have you manually added your SSH key to GitHub?\n\n"
@@ -1235,16 +1815,32 @@ Your configuration has been saved and Ogresync is ready to use!"""
         except Exception as e:
             return False, f"Error testing SSH: {str(e)}"
     
+    def _ensure_ssh_dir(self):
+        """Create the .ssh directory if it doesn't exist (checked once per wizard run)."""
+        if not self._ssh_dir_ensured:
+            os.makedirs(_SSH_DIR, mode=0o700, exist_ok=True)
+            self._ssh_dir_ensured = True
+    
+    def _get_ssh_pubkey(self):
+        """
+        Return the SSH public key text, or "" if there is no key yet.
+        The file is read once; _step_ssh_key_setup clears the cached copy
+        when it generates a new key.
+        """
+        if self._cached_ssh_pubkey is None:
+            try:
+                with open(_SSH_PUBKEY_PATH, 'r') as f:
+                    key = f.read().strip()
+            except FileNotFoundError:
+                # Not cached, so a key created later is still picked up
+                return ""
+            self._cached_ssh_pubkey = key
+        return self._cached_ssh_pubkey
+    
     def _show_enhanced_manual_ssh_dialog(self):
         """Show enhanced manual SSH setup dialog with clear instructions and SSH key display."""
         try:
-            # Read the SSH key
-            ssh_key_path = os.path.expanduser(os.path.join("~", ".ssh", "id_rsa.pub"))
-            ssh_key_content = ""
-            
-            if os.path.exists(ssh_key_path):
-                with open(ssh_key_path, 'r') as f:
-                    ssh_key_content = f.read().strip()
+            ssh_key_content = self._get_ssh_pubkey()
             
             if ui_elements and hasattr(ui_elements, 'show_ssh_key_success_dialog'):
                 # Use the enhanced SSH dialog from ui_elements (now improved)
@@ -1268,157 +1864,10 @@ Your configuration has been saved and Ogresync is ready to use!"""
                 )
     
     def _show_fallback_manual_ssh_dialog(self, ssh_key_content):
-        """Show fallback manual SSH dialog."""
-        dialog = tk.Toplevel(self.dialog)
-        dialog.title("Manual SSH Setup Required")
-        dialog.transient(self.dialog)
-        dialog.grab_set()
-        dialog.geometry("850x800")  # Increased size to accommodate all elements and buttons
-        dialog.configure(bg="#FAFBFC")
-        dialog.resizable(True, True)  # Allow resizing
-        
-        # Main frame
-        main_frame = tk.Frame(dialog, bg="#FAFBFC")
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        
-        # Title
-        title_label = tk.Label(
-            main_frame,
-            text="🔑 Manual SSH Setup Required",
-            font=("Arial", 16, "bold"),
-            bg="#FAFBFC",
-            fg="#1E293B"
-        )
-        title_label.pack(pady=(0, 20))
-        
-        # Instructions
-        instructions = (
-            "SSH connection to GitHub failed. Please follow these steps:\n\n"
-            "1. Copy your SSH key below (click 'Copy SSH Key')\n"
-            "2. Go to GitHub.com → Settings → SSH and GPG keys\n"
-            "3. Click 'New SSH key'\n"
-            "4. Paste your key and give it a title (e.g., 'Ogresync Key')\n"
-            "5. Click 'Add SSH key'\n"
-            "6. Return to Ogresync and click 'Execute: Test SSH' to continue\n\n"
-            "After adding the key to GitHub, the SSH test should pass."
-        )
-        
-        instr_label = tk.Label(
-            main_frame,
-            text=instructions,
-            font=("Arial", 11),
-            bg="#FAFBFC",
-            fg="#475569",
-            justify=tk.LEFT,
-            wraplength=700
-        )
-        instr_label.pack(pady=(0, 20))
-        
-        # SSH Key display
-        if ssh_key_content:
-            key_frame = tk.LabelFrame(
-                main_frame,
-                text="Your SSH Public Key",
-                font=("Arial", 10, "bold"),
-                bg="#FAFBFC",
-                fg="#1E293B",
-                padx=10,
-                pady=10
-            )
-            key_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
-            
-            # Create a scrollable text widget for the SSH key
-            key_scroll_frame = tk.Frame(key_frame, bg="#F8F9FA")
-            key_scroll_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            
-            key_text = tk.Text(
-                key_scroll_frame,
-                height=8,  # Increased height to show full key
-                wrap=tk.WORD,
-                font=("Courier", 9),
-                bg="#F8F9FA",
-                fg="#1E293B",
-                relief=tk.FLAT,
-                borderwidth=1
-            )
-            
-            # Add scrollbar for the text widget
-            scrollbar = tk.Scrollbar(key_scroll_frame, orient=tk.VERTICAL, command=key_text.yview)
-            key_text.configure(yscrollcommand=scrollbar.set)
-            
-            key_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            # Insert the full SSH key content
-            key_text.insert(tk.END, ssh_key_content)
-            key_text.config(state=tk.DISABLED)
-        
-        # Buttons frame with increased spacing
-        button_frame = tk.Frame(main_frame, bg="#FAFBFC")
-        button_frame.pack(fill=tk.X, pady=(20, 0))
-        
-        def copy_ssh_key():
-            try:
-                import pyperclip
-                pyperclip.copy(ssh_key_content)
-                if ui_elements:
-                    ui_elements.show_premium_info("Success", "SSH key copied to clipboard!", dialog)
-                else:
-                    messagebox.showinfo("Success", "SSH key copied to clipboard!")
-            except ImportError:
-                if ui_elements:
-                    ui_elements.show_premium_error("Error", "Could not copy to clipboard. Please copy manually.", dialog)
-                else:
-                    messagebox.showerror("Error", "Could not copy to clipboard. Please copy manually.")
-        
-        def open_github():
-            import webbrowser
-            webbrowser.open("https://github.com/settings/ssh/new")  # Direct link to add SSH key page
-        
-        # Copy button
-        copy_btn = tk.Button(
-            button_frame,
-            text="📋 Copy SSH Key",
-            command=copy_ssh_key,
-            font=("Arial", 10, "bold"),
-            bg="#6366F1",
-            fg="#FFFFFF",
-            relief=tk.FLAT,
-            cursor="hand2",
-            padx=20,
-            pady=12
-        )
-        copy_btn.pack(side=tk.LEFT, padx=(0, 12))
-        
-        # GitHub button - direct link to add SSH key page
-        github_btn = tk.Button(
-            button_frame,
-            text="🌐 Add SSH Key to GitHub",
-            command=open_github,
-            font=("Arial", 10, "bold"),
-            bg="#22C55E",
-            fg="#FFFFFF",
-            relief=tk.FLAT,
-            cursor="hand2",
-            padx=20,
-            pady=12
-        )
-        github_btn.pack(side=tk.LEFT, padx=(0, 12))
-        
-        # Close button
-        close_btn = tk.Button(
-            button_frame,
-            text="Close",
-            command=dialog.destroy,
-            font=("Arial", 10, "normal"),
-            bg="#EF4444",
-            fg="#FFFFFF",
-            relief=tk.FLAT,
-            cursor="hand2",
-            padx=20,
-            pady=12
-        )
-        close_btn.pack(side=tk.RIGHT)
+        """Show fallback manual SSH dialog, reusing the one built on an earlier attempt."""
+        if self._fallback_ssh_dialog is None or not self._fallback_ssh_dialog.exists():
+            self._fallback_ssh_dialog = _FallbackSshDialog(self.dialog)
+        self._fallback_ssh_dialog.show(ssh_key_content)
     
     def _step_github_repository(self):
         """Step 8: Configure GitHub repository with enhanced URL validation and format conversion."""
@@ -1427,31 +1876,37 @@ Your configuration has been saved and Ogresync is ready to use!"""
             if not vault_path:
                 return False, "Vault path not set."
             
-            # First ensure this is a git repository (should be done in step 4, but double-check)
-            import subprocess
-            git_check = subprocess.run(['git', 'status'], cwd=vault_path, capture_output=True, text=True)
-            if git_check.returncode != 0:
-                self._update_status("Initializing git repository...")
-                # Initialize git if not already done
-                init_result = subprocess.run(['git', 'init'], cwd=vault_path, capture_output=True, text=True)
-                if init_result.returncode != 0:
-                    return False, f"Failed to initialize git repository: {init_result.stderr}"
-                
-                # Set default branch to main
-                subprocess.run(['git', 'branch', '-M', 'main'], cwd=vault_path, capture_output=True, text=True)
-                
-                # Ensure git user config
-                self._safe_github_setup_call('ensure_git_user_config')
+            # First ensure this is a git repository (should be done in step 4, but double-check
+            # unless step 4 already established it in this run)
+            repo_state = self._git_repo_state(vault_path)
+            if not repo_state.get("is_repo"):
+                git_check = subprocess.run(['git', 'rev-parse', '--is-inside-work-tree'],
+                                           cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
+                if git_check.returncode != 0:
+                    self._update_status("Initializing git repository...")
+                    # Initialize git on the main branch if not already done
+                    init_result = _git_init_main(vault_path)
+                    if init_result.returncode != 0:
+                        return False, f"Failed to initialize git repository: {init_result.stderr}"
+                    
+                    # Ensure git user config
+                    self._safe_github_setup_call('ensure_git_user_config')
+                repo_state["is_repo"] = True
             
-            # Check if remote already exists
-            existing_remote_cmd = "git remote get-url origin"
-            existing_result = self._safe_ogresync_call('run_command', existing_remote_cmd, cwd=vault_path)
-            if existing_result[1] is None and existing_result[0] is not None:
-                # run_command returns (stdout, stderr, return_code)
-                existing_out, existing_error, existing_rc = existing_result[0]
-                existing_error = None if existing_rc == 0 else existing_error
+            # Check if remote already exists (known without asking git if this step ran before)
+            if "remote_url" in repo_state:
+                existing_out, existing_error = repo_state["remote_url"], None
             else:
-                existing_out, existing_error = existing_result[0], existing_result[1]
+                existing_remote_cmd = "git remote get-url origin"
+                existing_result = self._safe_ogresync_call('run_command', existing_remote_cmd, cwd=vault_path)
+                if existing_result[1] is None and existing_result[0] is not None:
+                    # run_command returns (stdout, stderr, return_code)
+                    existing_out, existing_error, existing_rc = existing_result[0]
+                    existing_error = None if existing_rc == 0 else existing_error
+                    # git answered: record the URL, or None for no origin
+                    repo_state["remote_url"] = existing_out.strip() if existing_rc == 0 and existing_out else None
+                else:
+                    existing_out, existing_error = existing_result[0], existing_result[1]
             
             if not existing_error and existing_out:
                 # Remote exists, ask if user wants to change it
@@ -1475,21 +1930,12 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     if not success:
                         return False, message
                     
-                    # Remove existing remote and add new one
-                    remove_cmd = "git remote remove origin"
-                    self._safe_ogresync_call('run_command', remove_cmd, cwd=vault_path)
-                    
-                    # Add new remote
-                    add_cmd = f"git remote add origin {new_url}"
-                    add_result = self._safe_ogresync_call('run_command', add_cmd, cwd=vault_path)
-                    if add_result[1] is None and add_result[0] is not None:
-                        # run_command returns (stdout, stderr, return_code)
-                        add_out, add_error, add_rc = add_result[0]
-                        add_error = None if add_rc == 0 else add_error
-                    else:
-                        add_out, add_error = add_result[0], add_result[1]
+                    # Replace the existing remote with the new one
+                    repo_state.pop("remote_url", None)
+                    add_error = self._set_origin_remote(vault_path, new_url, replace=True)
                     
                     if not add_error:
+                        repo_state["remote_url"] = new_url
                         # Update config with new URL
                         config_data = self._safe_ogresync_get('config_data')
                         if config_data:
@@ -1517,16 +1963,10 @@ Your configuration has been saved and Ogresync is ready to use!"""
                     return False, message
                 
                 # Add remote
-                add_cmd = f"git remote add origin {repo_url}"
-                add_result = self._safe_ogresync_call('run_command', add_cmd, cwd=vault_path)
-                if add_result[1] is None and add_result[0] is not None:
-                    # run_command returns (stdout, stderr, return_code)
-                    add_out, add_error, add_rc = add_result[0]
-                    add_error = None if add_rc == 0 else add_error
-                else:
-                    add_out, add_error = add_result[0], add_result[1]
+                add_error = self._set_origin_remote(vault_path, repo_url, replace=False)
                 
                 if not add_error:
+                    repo_state["remote_url"] = repo_url
                     # Update config with URL
                     config_data = self._safe_ogresync_get('config_data')
                     if config_data:
@@ -1541,13 +1981,55 @@ Your configuration has been saved and Ogresync is ready to use!"""
         except Exception as e:
             return False, f"Error setting up GitHub repository: {str(e)}"
 
+    def _pygit2_repository(self, vault_path):
+        """Return a pygit2.Repository for vault_path (opened once), or None without pygit2."""
+        if pygit2 is None:
+            return None
+        repo = self._pygit2_repos.get(vault_path)
+        if repo is None:
+            try:
+                repo = self._pygit2_repos[vault_path] = pygit2.Repository(vault_path)
+            except (pygit2.GitError, KeyError) as e:
+                print(f"[DEBUG] pygit2 could not open {vault_path}: {e}")
+                return None
+        return repo
+    
+    def _set_origin_remote(self, vault_path, url, replace):
+        """
+        Point the origin remote at url, removing an existing origin first if replace is set.
+        Uses pygit2 when available and falls back to git otherwise.
+        Returns None on success or an error message.
+        """
+        repo = self._pygit2_repository(vault_path)
+        if repo is not None:
+            try:
+                if replace:
+                    try:
+                        repo.remotes.delete("origin")
+                    except KeyError:
+                        pass  # no origin to remove
+                repo.remotes.create("origin", url)
+                return None
+            except (pygit2.GitError, ValueError) as e:
+                print(f"[DEBUG] pygit2 could not configure origin, using git instead: {e}")
+        
+        if replace:
+            remove_cmd = "git remote remove origin"
+            self._safe_ogresync_call('run_command', remove_cmd, cwd=vault_path)
+        
+        add_cmd = f"git remote add origin {url}"
+        add_result = self._safe_ogresync_call('run_command', add_cmd, cwd=vault_path)
+        if add_result[1] is None and add_result[0] is not None:
+            # run_command returns (stdout, stderr, return_code)
+            add_out, add_error, add_rc = add_result[0]
+            return None if add_rc == 0 else add_error
+        return add_result[1]
+    
     def _get_validated_repository_url(self, vault_path):
         """
         Enhanced repository URL input with validation and format conversion.
         Returns: (success: bool, url: str, message: str)
         """
-        import re
-        
         config_data = self._safe_ogresync_get('config_data')
         saved_url = config_data.get("GITHUB_REMOTE_URL", "") if config_data else ""
         max_attempts = 3
@@ -1669,8 +2151,6 @@ Your configuration has been saved and Ogresync is ready to use!"""
         Validate and convert repository URL to SSH format if needed.
         Returns: (success: bool, converted_url: str, error_msg: str)
         """
-        import re
-        
         url = url.strip()
         
         # SSH format pattern: git@github.com:username/repo.git
@@ -1712,6 +2192,9 @@ Your configuration has been saved and Ogresync is ready to use!"""
         Test if the repository is accessible.
         Returns: (success: bool, message: str)
         """
+        if repo_url in self._accessible_repo_urls:
+            return True, "Repository is accessible"
+        
         try:
             # Test connectivity with a simple ls-remote command (doesn't modify anything)
             test_cmd = f"git ls-remote {repo_url} HEAD"
@@ -1724,6 +2207,9 @@ Your configuration has been saved and Ogresync is ready to use!"""
                 test_out, test_error = test_result[0], test_result[1]
             
             if not test_error and test_out:
+                # Only successes are remembered: a failure may be fixed (e.g. by adding
+                # the SSH key to GitHub) before the next attempt
+                self._accessible_repo_urls.add(repo_url)
                 return True, "Repository is accessible"
             else:
                 # Parse common error messages from test_error if available
@@ -1755,7 +2241,7 @@ Your configuration has been saved and Ogresync is ready to use!"""
             
             # Update step status to running
             current_step = self.setup_steps[8]  # 0-indexed, step 9
-            current_step.set_status("running")
+            current_step.set_status(StepStatus.RUNNING)
             self._update_step_display()
             
             self._update_status("🔍 Analyzing repository state for synchronization...")
@@ -1771,9 +2257,8 @@ Your configuration has been saved and Ogresync is ready to use!"""
             if not remote_url:
                 # Fallback 2: Try to get from git directly
                 try:
-                    import subprocess
                     result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
-                                          cwd=vault_path, capture_output=True, text=True)
+                                          cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                     if result.returncode == 0:
                         remote_url = result.stdout.strip()
                         # Update wizard state for future steps
@@ -1826,7 +2311,7 @@ Your configuration has been saved and Ogresync is ready to use!"""
             # Ensure current_step is available for error reporting
             try:
                 current_step = self.setup_steps[8]  # Step 9 (0-indexed)
-                current_step.set_status("error", str(e))
+                current_step.set_status(StepStatus.ERROR, str(e))
             except:
                 pass  # If we can't set step status, just continue
             return False, f"Error during repository sync: {str(e)}"
@@ -1841,43 +2326,46 @@ Your configuration has been saved and Ogresync is ready to use!"""
         Returns:
             str: Current branch name (defaults to 'main' if detection fails)
         """
+        repo_state = self._git_repo_state(vault_path)
+        if repo_state.get("branch"):
+            return repo_state["branch"]
+        
         try:
-            # Try to get current branch
-            current_branch_result = subprocess.run(['git', 'branch', '--show-current'], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+            # Try to get current branch (named even before its first commit; fails on a detached HEAD)
+            current_branch_result = subprocess.run(['git', 'symbolic-ref', '-q', '--short', 'HEAD'], 
+                                                 cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if current_branch_result.returncode == 0 and current_branch_result.stdout.strip():
                 branch_name = current_branch_result.stdout.strip()
                 print(f"[DEBUG] Dynamic branch detection: Using current branch '{branch_name}'")
+                # The wizard never switches branches, so this holds for the rest of the run
+                repo_state["branch"] = branch_name
                 return branch_name
             
-            # Fallback: try to get default branch from remote
-            default_branch_result = subprocess.run(['git', 'symbolic-ref', 'refs/remotes/origin/HEAD'], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+            # Fallbacks use the remote-tracking refs, listed once: "<refname> <symref target>"
+            remote_refs_result = subprocess.run(['git', 'for-each-ref', '--format=%(refname) %(symref)', 'refs/remotes/origin'], 
+                                              cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
-            if default_branch_result.returncode == 0 and default_branch_result.stdout.strip():
-                # Extract branch name from refs/remotes/origin/branch_name
-                ref_line = default_branch_result.stdout.strip()
-                if 'refs/remotes/origin/' in ref_line:
-                    branch_name = ref_line.split('refs/remotes/origin/')[-1]
+            if remote_refs_result.returncode == 0:
+                remote_refs = {}
+                for ref_line in remote_refs_result.stdout.splitlines():
+                    refname, _, symref = ref_line.partition(' ')
+                    remote_refs[refname] = symref
+                
+                # Fallback: the remote's default branch, which origin/HEAD points to
+                default_ref = remote_refs.get('refs/remotes/origin/HEAD', '')
+                if default_ref.startswith('refs/remotes/origin/'):
+                    branch_name = default_ref[len('refs/remotes/origin/'):]
                     print(f"[DEBUG] Dynamic branch detection: Using remote default branch '{branch_name}'")
                     return branch_name
-            
-            # Final fallback: check what branches exist on remote
-            remote_branches_result = subprocess.run(['git', 'branch', '-r'], 
-                                                  cwd=vault_path, capture_output=True, text=True)
-            
-            if remote_branches_result.returncode == 0:
-                remote_branches = remote_branches_result.stdout.strip().split('\n')
-                for branch_line in remote_branches:
-                    branch_line = branch_line.strip()
-                    # Look for main or master branch
-                    if 'origin/main' in branch_line:
-                        print(f"[DEBUG] Dynamic branch detection: Found 'main' branch on remote")
-                        return 'main'
-                    elif 'origin/master' in branch_line:
-                        print(f"[DEBUG] Dynamic branch detection: Found 'master' branch on remote")
-                        return 'master'
+                
+                # Final fallback: look for main or master branch on remote
+                if 'refs/remotes/origin/main' in remote_refs:
+                    print(f"[DEBUG] Dynamic branch detection: Found 'main' branch on remote")
+                    return 'main'
+                elif 'refs/remotes/origin/master' in remote_refs:
+                    print(f"[DEBUG] Dynamic branch detection: Found 'master' branch on remote")
+                    return 'master'
             
             # Ultimate fallback
             print(f"[DEBUG] Dynamic branch detection: Using default fallback 'main'")
@@ -1964,11 +2452,10 @@ Your configuration has been saved and Ogresync is ready to use!"""
     
     def _check_remote_repository(self, vault_path):
         """Check if remote repository exists and get its files."""
-        import subprocess
         try:
             # Fetch remote information
             fetch_result = subprocess.run(['git', 'fetch', 'origin'], 
-                                        cwd=vault_path, capture_output=True, text=True, timeout=30)
+                                        cwd=vault_path, capture_output=True, text=True, timeout=30, **_POPEN_KW)
             
             if fetch_result.returncode == 0:
                 # Dynamically detect the remote branch
@@ -1977,7 +2464,7 @@ Your configuration has been saved and Ogresync is ready to use!"""
                 
                 # Check if remote branch exists and has files
                 ls_result = subprocess.run(['git', 'ls-tree', '-r', '--name-only', remote_branch_ref], 
-                                         cwd=vault_path, capture_output=True, text=True)
+                                         cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if ls_result.returncode == 0 and ls_result.stdout.strip():
                     remote_files = [f.strip() for f in ls_result.stdout.splitlines() if f.strip()]
@@ -2037,20 +2524,18 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                     f.write(readme_content)
                 
                 # Commit the README
-                import subprocess
-                subprocess.run(['git', 'add', 'README.md'], cwd=vault_path, check=True)
-                subprocess.run(['git', 'commit', '-m', 'Initial commit: Add README'], cwd=vault_path, check=True)
+                subprocess.run(['git', 'add', 'README.md'], cwd=vault_path, check=True, **_POPEN_KW)
+                subprocess.run(['git', 'commit', '-m', 'Initial commit: Add README'], cwd=vault_path, check=True, **_POPEN_KW)
             except Exception as e:
                 print(f"[DEBUG] Error creating README: {e}")
         
-        current_step.set_status("success")
+        current_step.set_status(StepStatus.SUCCESS)
         return True, "Both repositories initialized - ready for synchronization"
     
     def _handle_simple_pull(self, vault_path, remote_files, current_step):
         """Handle Scenario 2: Local is empty, remote has files - simple pull."""
         self._update_status(f"📥 Pulling {len(remote_files)} files from remote repository...")
         
-        import subprocess
         try:
             # Get the current branch dynamically
             current_branch = self._get_current_branch(vault_path)
@@ -2059,7 +2544,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # Check current git status before pull
             status_result = subprocess.run(['git', 'status', '--porcelain'], 
-                                         cwd=vault_path, capture_output=True, text=True)
+                                         cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             print(f"[DEBUG] Git status before pull: '{status_result.stdout.strip()}'")
             
             # Check what files currently exist in working directory
@@ -2075,7 +2560,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
               # Simple pull since local is empty
             print(f"[DEBUG] Executing: git pull origin {current_branch} --allow-unrelated-histories")
             pull_result = subprocess.run(['git', 'pull', 'origin', current_branch, '--allow-unrelated-histories'], 
-                                       cwd=vault_path, capture_output=True, text=True, timeout=60)
+                                       cwd=vault_path, capture_output=True, text=True, timeout=60, **_POPEN_KW)
             
             print(f"[DEBUG] Pull result - Return code: {pull_result.returncode}")
             print(f"[DEBUG] Pull result - STDOUT: {pull_result.stdout}")
@@ -2100,7 +2585,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 # Check if we actually got the expected remote files
                 if len(meaningful_files_after_pull) >= len(remote_files):
                     print(f"[DEBUG] Pull successful - got {len(meaningful_files_after_pull)} meaningful files")
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, f"Successfully pulled {len(remote_files)} files from remote repository"
                 else:
                     print(f"[DEBUG] Pull said 'success' but missing files. Expected {len(remote_files)}, got {len(meaningful_files_after_pull)}")
@@ -2116,7 +2601,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             # First, ensure we have the latest remote state
             print(f"[DEBUG] Executing: git fetch origin {current_branch}")
             fetch_result = subprocess.run(['git', 'fetch', 'origin', current_branch], 
-                                        cwd=vault_path, capture_output=True, text=True)
+                                        cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             print(f"[DEBUG] Fetch result - Return code: {fetch_result.returncode}")
             print(f"[DEBUG] Fetch result - STDOUT: {fetch_result.stdout}")
             print(f"[DEBUG] Fetch result - STDERR: {fetch_result.stderr}")
@@ -2126,7 +2611,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # Check git status before reset
             status_before_reset = subprocess.run(['git', 'status', '--porcelain'], 
-                                               cwd=vault_path, capture_output=True, text=True)
+                                               cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             print(f"[DEBUG] Git status before reset: '{status_before_reset.stdout.strip()}'")
             
             # Safety check 1: Check for uncommitted changes
@@ -2138,11 +2623,11 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 self._update_status("⚠️ Uncommitted changes detected - creating safety backup...")
                 
                 # Create a safety commit to preserve any changes
-                safety_commit_result = subprocess.run(['git', 'add', '-A'], cwd=vault_path, capture_output=True, text=True)
+                safety_commit_result = subprocess.run(['git', 'add', '-A'], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 if safety_commit_result.returncode == 0:
                     commit_msg = f"Safety backup before reset - {time.strftime('%Y-%m-%d %H:%M:%S')}"
                     commit_result = subprocess.run(['git', 'commit', '-m', commit_msg], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+                                                 cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                     if commit_result.returncode == 0:
                         print(f"[DEBUG] Created safety commit: {commit_msg}")
                     else:
@@ -2150,12 +2635,12 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # Safety check 2: Compare local vs remote commits
             local_commit_result = subprocess.run(['git', 'rev-parse', 'HEAD'], 
-                                               cwd=vault_path, capture_output=True, text=True)
+                                               cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             remote_commit_result = subprocess.run(['git', 'rev-parse', remote_branch_ref], 
-                                                cwd=vault_path, capture_output=True, text=True)
+                                                cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             local_ahead_check = subprocess.run(['git', 'rev-list', '--count', f'{remote_branch_ref}..HEAD'], 
-                                             cwd=vault_path, capture_output=True, text=True)
+                                             cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if local_commit_result.returncode == 0 and remote_commit_result.returncode == 0:
                 local_commit = local_commit_result.stdout.strip()
@@ -2191,7 +2676,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # First try: checkout the remote branch files without changing history
             checkout_result = subprocess.run(['git', 'checkout', remote_branch_ref, '--', '.'], 
-                                           cwd=vault_path, capture_output=True, text=True)
+                                           cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             print(f"[DEBUG] Checkout result - Return code: {checkout_result.returncode}")
             print(f"[DEBUG] Checkout result - STDOUT: {checkout_result.stdout}")
             print(f"[DEBUG] Checkout result - STDERR: {checkout_result.stderr}")
@@ -2212,14 +2697,14 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 
                 if len(meaningful_files_after_checkout) >= len(remote_files):
                     print(f"[DEBUG] Checkout successful - got {len(meaningful_files_after_checkout)} meaningful files")
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, f"Successfully retrieved {len(remote_files)} files using safe checkout method"
             
             # If checkout didn't work, fall back to reset but with all safety measures in place
             print(f"[DEBUG] Checkout approach failed, proceeding with reset (safety measures active)...")
             print(f"[DEBUG] Executing: git reset --hard {remote_branch_ref}")
             reset_result = subprocess.run(['git', 'reset', '--hard', remote_branch_ref], 
-                                        cwd=vault_path, capture_output=True, text=True)
+                                        cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             print(f"[DEBUG] Reset result - Return code: {reset_result.returncode}")
             print(f"[DEBUG] Reset result - STDOUT: {reset_result.stdout}")
             print(f"[DEBUG] Reset result - STDERR: {reset_result.stderr}")
@@ -2241,7 +2726,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 
                 if len(meaningful_files_after_reset) >= len(remote_files):
                     print(f"[DEBUG] Reset successful - got {len(meaningful_files_after_reset)} meaningful files")
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, f"Successfully retrieved {len(remote_files)} files using reset method"
                 else:
                     print(f"[DEBUG] Reset completed but still missing files. Expected {len(remote_files)}, got {len(meaningful_files_after_reset)}")
@@ -2260,14 +2745,12 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
         self._update_status(f"📤 Remote repository is empty - preparing to push {len(local_files)} local files...")
         
         try:
-            import subprocess
-            
             # Ensure all local files are committed
             self._update_status("📝 Ensuring all local files are committed...")
             
             # Check if there are uncommitted changes
             status_result = subprocess.run(['git', 'status', '--porcelain'], 
-                                         cwd=vault_path, capture_output=True, text=True)
+                                         cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if status_result.returncode == 0 and status_result.stdout.strip():
                 # There are uncommitted changes, commit them
@@ -2275,12 +2758,12 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 
                 # Add all files
                 add_result = subprocess.run(['git', 'add', '.'], 
-                                          cwd=vault_path, capture_output=True, text=True)
+                                          cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if add_result.returncode == 0:
                     # Commit changes
                     commit_result = subprocess.run(['git', 'commit', '-m', f'Initial vault content - {len(local_files)} files'], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+                                                 cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                     
                     if commit_result.returncode == 0:
                         print(f"[DEBUG] Successfully committed {len(local_files)} local files")
@@ -2297,19 +2780,19 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # Get current branch
             current_branch_result = subprocess.run(['git', 'branch', '--show-current'], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+                                                 cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             current_branch = current_branch_result.stdout.strip() if current_branch_result.returncode == 0 else "main"
             
             print(f"[DEBUG] Attempting to push branch '{current_branch}' to remote")
             
             # Push to remote
             push_result = subprocess.run(['git', 'push', 'origin', current_branch], 
-                                       cwd=vault_path, capture_output=True, text=True, timeout=60)
+                                       cwd=vault_path, capture_output=True, text=True, timeout=60, **_POPEN_KW)
             
             if push_result.returncode == 0:
                 print(f"[DEBUG] Successfully pushed {len(local_files)} files to remote")
                 self._update_status(f"✅ Successfully pushed {len(local_files)} files to remote repository!")
-                current_step.set_status("success")
+                current_step.set_status(StepStatus.SUCCESS)
                 return True, f"Successfully pushed {len(local_files)} local files to remote repository"
             else:
                 # Push failed, but don't fail the step - we'll try again in final sync
@@ -2319,20 +2802,20 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 # Check if it's an authentication or permission issue
                 if "permission denied" in push_error.lower() or "authentication failed" in push_error.lower():
                     self._update_status("⚠️ Push failed due to authentication - will retry in final sync step")
-                    current_step.set_status("success")  # Don't fail the step, authentication might be resolved
+                    current_step.set_status(StepStatus.SUCCESS)  # Don't fail the step, authentication might be resolved
                     return True, f"Local files committed and ready for push - will retry authentication in final sync"
                 elif "repository not found" in push_error.lower():
                     return False, f"Repository not found. Please verify the repository URL is correct: {push_error}"
                 else:
                     # Other error - mark for retry in final sync
                     self._update_status("⚠️ Push temporarily failed - will retry in final sync step")
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, f"Local files committed and ready for push - will retry in final sync: {push_error}"
                     
         except Exception as e:
             print(f"[DEBUG] Exception in _handle_remote_empty: {e}")
             # Don't fail the step, just mark files as ready for final sync
-            current_step.set_status("success")
+            current_step.set_status(StepStatus.SUCCESS)
             return True, f"Local files prepared for push - final sync will complete the upload: {str(e)}"
     
     def _handle_conflict_resolution(self, vault_path, remote_url, local_files, remote_files, current_step):
@@ -2369,11 +2852,11 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 # If there are no conflicts, we can do a simple pull/merge
                 try:
                     # Update the current step to show success
-                    current_step.set_status("success", "No conflicts - repositories are compatible")
+                    current_step.set_status(StepStatus.SUCCESS, "No conflicts - repositories are compatible")
                     
                     # Perform a simple git pull to sync everything
                     result = subprocess.run(['git', 'pull', 'origin'], 
-                                          cwd=vault_path, capture_output=True, text=True, timeout=30)
+                                          cwd=vault_path, capture_output=True, text=True, timeout=30, **_POPEN_KW)
                     
                     if result.returncode == 0:
                         print("✅ Simple sync completed successfully")
@@ -2425,11 +2908,11 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 try:
                     # Try a simple pull first
                     pull_result = subprocess.run(['git', 'pull', 'origin'], 
-                                              cwd=vault_path, capture_output=True, text=True, timeout=30)
+                                              cwd=vault_path, capture_output=True, text=True, timeout=30, **_POPEN_KW)
                     
                     if pull_result.returncode == 0:
                         print("✅ Simple sync completed successfully")
-                        current_step.set_status("success", "No conflicts - repositories are compatible")
+                        current_step.set_status(StepStatus.SUCCESS, "No conflicts - repositories are compatible")
                         self._update_status("✅ Repositories synchronized successfully!")
                         return True, f"Repositories synchronized successfully - no conflicts detected ({len(local_files)} files are identical)"
                     else:
@@ -2439,11 +2922,11 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                         remote_branch_ref = self._get_remote_branch_ref(vault_path, current_branch)
                         
                         merge_result = subprocess.run(['git', 'merge', remote_branch_ref, '--allow-unrelated-histories', '--no-edit'], 
-                                                   cwd=vault_path, capture_output=True, text=True, timeout=60)
+                                                   cwd=vault_path, capture_output=True, text=True, timeout=60, **_POPEN_KW)
                         
                         if merge_result.returncode == 0:
                             print("✅ Simple merge completed successfully")
-                            current_step.set_status("success", "No conflicts - repositories are compatible")
+                            current_step.set_status(StepStatus.SUCCESS, "No conflicts - repositories are compatible")
                             return True, f"Repositories synchronized successfully - no conflicts detected ({len(local_files)} files are identical)"
                         else:
                             print(f"⚠️ Both pull and merge failed, falling back to conflict resolution: {merge_result.stderr}")
@@ -2477,7 +2960,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 
                 if resolution_result.success:
                     print(f"[DEBUG] Conflict resolution successful: {resolution_result.message}")
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, f"Repositories synchronized using {selected_strategy.value}: {resolution_result.message}"
                 else:
                     print(f"[DEBUG] Conflict resolution failed: {resolution_result.message}")
@@ -2505,7 +2988,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
         print("[WARNING] Using simple merge fallback - this should only happen in extreme edge cases!")
         self._update_status("📦 Attempting simple merge with remote repository...")
         
-        import subprocess
         try:
             # Get the current branch dynamically
             current_branch = self._get_current_branch(vault_path)
@@ -2513,14 +2995,14 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # Try a simple merge pull
             pull_result = subprocess.run(['git', 'pull', 'origin', current_branch, '--allow-unrelated-histories', '--no-rebase'], 
-                                       cwd=vault_path, capture_output=True, text=True, timeout=60)
+                                       cwd=vault_path, capture_output=True, text=True, timeout=60, **_POPEN_KW)
             
             if pull_result.returncode == 0:
-                current_step.set_status("success")
+                current_step.set_status(StepStatus.SUCCESS)
                 return True, "Successfully merged with remote repository"
             else:
                 if "Already up to date" in pull_result.stdout:
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, "Repository is already synchronized"
                 elif "CONFLICT" in pull_result.stdout:
                     # There are merge conflicts - this should NOT be treated as success
@@ -2537,26 +3019,24 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
         
         try:
             # Try basic fetch and status check
-            import subprocess
-            
             fetch_result = subprocess.run(['git', 'fetch', 'origin'], 
-                                        cwd=vault_path, capture_output=True, text=True, timeout=30)
+                                        cwd=vault_path, capture_output=True, text=True, timeout=30, **_POPEN_KW)
             
             if fetch_result.returncode == 0:
                 # Try a conservative pull
                 pull_result = subprocess.run(['git', 'pull', 'origin', 'main', '--allow-unrelated-histories'], 
-                                           cwd=vault_path, capture_output=True, text=True, timeout=60)
+                                           cwd=vault_path, capture_output=True, text=True, timeout=60, **_POPEN_KW)
                 
                 if pull_result.returncode == 0:
-                    current_step.set_status("success")
+                    current_step.set_status(StepStatus.SUCCESS)
                     return True, "Repository synchronized successfully (unknown scenario handled)"
             
             # If we get here, just mark as success and let the next step handle it
-            current_step.set_status("success")
+            current_step.set_status(StepStatus.SUCCESS)
             return True, "Repository sync completed with unknown state - will be resolved in final sync"
             
         except Exception as e:
-            current_step.set_status("success")  # Don't fail the setup for unknown scenarios
+            current_step.set_status(StepStatus.SUCCESS)  # Don't fail the setup for unknown scenarios
             return True, f"Repository sync completed with issues: {str(e)}"
     
     def _step_final_sync(self):
@@ -2576,8 +3056,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             self._update_status("🔄 Finalizing repository synchronization...")
             
-            import subprocess
-            
             # CRITICAL: Check and respect user's conflict resolution choice
             conflict_strategy = self.wizard_state.get("conflict_resolution_strategy")
             if conflict_strategy:
@@ -2592,12 +3070,12 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                         
                         # Check if there are unpushed commits (in case push failed during conflict resolution)
                         unpushed_result = subprocess.run(['git', 'log', 'origin/main..HEAD', '--oneline'], 
-                                                       cwd=vault_path, capture_output=True, text=True)
+                                                       cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                         
                         if unpushed_result.returncode == 0 and unpushed_result.stdout.strip():
                             print("[DEBUG] Final sync - Found unpushed commits after SMART_MERGE, attempting push")
                             push_result = subprocess.run(['git', 'push', '-u', 'origin', 'main'], 
-                                                       cwd=vault_path, capture_output=True, text=True)
+                                                       cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                             if push_result.returncode == 0:
                                 print("[DEBUG] Final sync - Successfully pushed remaining commits")
                                 self._update_status("✅ Smart merge complete - all changes pushed to GitHub")
@@ -2615,16 +3093,16 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # STEP 1: Always commit any uncommitted changes
             status_result = subprocess.run(['git', 'status', '--porcelain'], 
-                                         cwd=vault_path, capture_output=True, text=True)
+                                         cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if status_result.returncode == 0 and status_result.stdout.strip():
                 print("[DEBUG] Final sync - Committing uncommitted changes")
                 self._update_status("📝 Committing final changes...")
                 
-                subprocess.run(['git', 'add', '.'], cwd=vault_path, capture_output=True, text=True)
+                subprocess.run(['git', 'add', '.'], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 commit_result = subprocess.run([
                     'git', 'commit', '-m', 'Final setup commit - ensure all changes are saved'
-                ], cwd=vault_path, capture_output=True, text=True)
+                ], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if commit_result.returncode == 0:
                     print("[DEBUG] Final sync - Successfully committed changes")
@@ -2633,15 +3111,15 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             
             # STEP 2: Check if we need to push (ONLY for empty remote scenario)
             current_branch_result = subprocess.run(['git', 'branch', '--show-current'], 
-                                                 cwd=vault_path, capture_output=True, text=True)
+                                                 cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             current_branch = current_branch_result.stdout.strip() if current_branch_result.returncode == 0 else "main"
             
             # Fetch latest remote state
-            subprocess.run(['git', 'fetch', 'origin'], cwd=vault_path, capture_output=True, text=True)
+            subprocess.run(['git', 'fetch', 'origin'], cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             # Check if remote branch exists - this is the key indicator
             remote_branch_exists = subprocess.run(['git', 'rev-parse', '--verify', f'origin/{current_branch}'], 
-                                                cwd=vault_path, capture_output=True, text=True)
+                                                cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if remote_branch_exists.returncode != 0:
                 # Remote branch doesn't exist = empty remote scenario
@@ -2649,7 +3127,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 self._update_status("📤 Pushing local content to empty remote repository...")
                 
                 push_result = subprocess.run(['git', 'push', '-u', 'origin', current_branch], 
-                                           cwd=vault_path, capture_output=True, text=True, timeout=120)
+                                           cwd=vault_path, capture_output=True, text=True, timeout=120, **_POPEN_KW)
                 
                 if push_result.returncode == 0:
                     print("[DEBUG] Final sync - Successfully pushed to empty remote")
@@ -2673,7 +3151,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 
                 # Check if we're ahead of remote (have unpushed commits)
                 ahead_result = subprocess.run(['git', 'rev-list', '--count', f'origin/{current_branch}..HEAD'], 
-                                            cwd=vault_path, capture_output=True, text=True)
+                                            cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if ahead_result.returncode == 0:
                     try:
@@ -2737,9 +3215,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
     
     def _show_obsidian_installation_guidance(self):
         """Shows OS-specific Obsidian installation guidance."""
-        import platform
-        import webbrowser
-        
         os_name = platform.system().lower()
         
         # Determine OS-specific instructions
@@ -2826,9 +3301,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
     
     def _show_git_installation_guidance(self):
         """Shows OS-specific Git installation guidance."""
-        import platform
-        import webbrowser
-        
         os_name = platform.system().lower()
         
         # Determine OS-specific instructions
@@ -2920,8 +3392,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
     
     def _show_installation_dialog(self, title, instructions, download_url, store_url=None):
         """Shows a comprehensive installation guidance dialog with retry functionality."""
-        import webbrowser
-        
         if ui_elements and hasattr(ui_elements, 'show_premium_info'):
             # Enhanced dialog if ui_elements supports it
             dialog = tk.Toplevel(self.dialog)
@@ -3087,6 +3557,10 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
                 f"Have you completed the {software_name} installation?\n\n"
                 f"Click 'Yes' to retry detection, or 'No' to continue with the setup process."
             )
+        if retry:
+            # Newly installed software may now be on PATH
+            self.wizard_state["tool_paths"].clear()
+            self._tool_path_futures.clear()
         return retry
 
     def _safe_pull_remote_files(self, vault_path, force_reset=False):
@@ -3100,8 +3574,6 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
         Returns:
             Tuple[bool, str]: (success, message)
         """
-        import subprocess
-        
         try:
             # Get the current branch dynamically
             current_branch = self._get_current_branch(vault_path)
@@ -3111,14 +3583,14 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             # First, ensure we have the latest remote information
             self._update_status("Fetching latest remote information...")
             fetch_result = subprocess.run(['git', 'fetch', 'origin'], 
-                                        cwd=vault_path, capture_output=True, text=True)
+                                        cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if fetch_result.returncode != 0:
                 return False, f"Failed to fetch remote information: {fetch_result.stderr}"
             
             # Check if remote has any files
             ls_result = subprocess.run(['git', 'ls-tree', '-r', '--name-only', remote_branch_ref], 
-                                     cwd=vault_path, capture_output=True, text=True)
+                                     cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
             
             if ls_result.returncode != 0 or not ls_result.stdout.strip():
                 return True, "Remote repository is empty - no files to pull"
@@ -3135,7 +3607,7 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             if force_reset:
                 # Use reset for empty local repos to get exact remote state
                 reset_result = subprocess.run(['git', 'reset', '--hard', remote_branch_ref], 
-                                            cwd=vault_path, capture_output=True, text=True)
+                                            cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if reset_result.returncode == 0:
                     return True, f"Successfully downloaded {len(content_files)} files using reset method"
@@ -3144,14 +3616,14 @@ Created: {time.strftime('%Y-%m-%d %H:%M:%S')}
             else:
                 # Use merge for repos with existing content to preserve history
                 merge_result = subprocess.run(['git', 'merge', remote_branch_ref, '--allow-unrelated-histories', '--no-ff'], 
-                                            cwd=vault_path, capture_output=True, text=True)
+                                            cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                 
                 if merge_result.returncode == 0:
                     return True, f"Successfully merged {len(content_files)} remote files"
                 else:
                     # Fallback to pull with unrelated histories
                     pull_result = subprocess.run(['git', 'pull', 'origin', current_branch, '--allow-unrelated-histories', '--no-rebase'], 
-                                               cwd=vault_path, capture_output=True, text=True)
+                                               cwd=vault_path, capture_output=True, text=True, **_POPEN_KW)
                     
                     if pull_result.returncode == 0:
                         return True, f"Successfully pulled {len(content_files)} remote files (fallback method)"